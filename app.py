@@ -1,17 +1,146 @@
 import socket
+import numpy as np
 import pandas as pd
+import hmac
 import json
 import os
+import re
+import time
+from contextlib import contextmanager
+from functools import wraps
 from io import BytesIO
-from flask import Flask, render_template, request, send_file, redirect, url_for, jsonify, session
+from flask import (Flask, render_template, request, send_file, redirect, url_for, jsonify, session, Response,
+                   g, has_request_context, before_render_template, template_rendered)
 from datetime import datetime, timedelta
 
 app = Flask(__name__, static_folder='static')
 app.secret_key = 'supersecretkey'  # Required for session to work
 
-# Reset temp directory when server starts
-from utils import reset_temp_directory
-reset_temp_directory()
+# Reset temp directory when server starts and evict expired session files in the
+# background (not in export pool workers, which import this module again, as
+# __mp_main__ when the server was started with `python app.py`)
+import multiprocessing
+from utils import reset_temp_directory, start_janitor
+if multiprocessing.parent_process() is None and __name__ != '__mp_main__':
+    reset_temp_directory()
+    start_janitor()
+
+# Stage timing: every stage is observed in the timesheet_stage_seconds histogram
+# (/metrics) and, within a request, reported in its Server-Timing header
+@contextmanager
+def timed_stage(stage):
+    """Time the enclosed block as `stage`"""
+    from utils import observe
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe('timesheet_stage_seconds', elapsed, stage=stage)
+        if has_request_context():
+            g.setdefault('stage_timings', []).append((stage, elapsed))
+
+def timed(function):
+    """Decorator timing each call of `function` as a stage named after it"""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with timed_stage(function.__name__):
+            return function(*args, **kwargs)
+    return wrapper
+
+@before_render_template.connect_via(app)
+def _start_render_timer(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('render_starts', []).append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def _stop_render_timer(sender, template, context, **extra):
+    from utils import observe
+    if has_request_context() and g.get('render_starts'):
+        elapsed = time.perf_counter() - g.render_starts.pop()
+        observe('timesheet_stage_seconds', elapsed, stage='render_template')
+        g.setdefault('stage_timings', []).append(('render_template', elapsed))
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+# Opt-in sampling profiler for the report routes. An admin enables it per request
+# with ?profile=<PROFILE_TOKEN> or an X-Profile-Token header; without PROFILE_TOKEN
+# set, profiling is off. The profile covers streamed bodies up to the last chunk.
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILED_ENDPOINTS = {'results', 'download_report', 'download_bulk_reports'}
+
+def profiling_requested():
+    """Whether the current request asks for a profile with the admin token"""
+    if not PROFILE_TOKEN or request.endpoint not in PROFILED_ENDPOINTS:
+        return False
+    token = request.args.get('profile') or request.headers.get('X-Profile-Token', '')
+    return hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode())
+
+@app.before_request
+def _start_profiler():
+    if profiling_requested():
+        from utils import start_profile
+        name = f"{request.endpoint}-{datetime.now():%Y%m%dT%H%M%S}-{os.urandom(4).hex()}"
+        g.profile = start_profile(name)
+
+@app.after_request
+def _finish_profiler(response):
+    """Write the profile once the response body has been generated"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        from utils import stop_profile
+        response.headers['X-Profile'] = os.path.basename(profile['path'])
+        if response.direct_passthrough:
+            # send_file bodies are ready (and skip the response's close callbacks)
+            stop_profile(profile)
+        else:
+            response.call_on_close(lambda: stop_profile(profile))
+    return response
+
+@app.before_request
+def _start_memory_tracking():
+    from utils import start_memory_tracking
+    g.memory_tracking = start_memory_tracking()
+
+@app.after_request
+def _record_peak_memory(response):
+    """
+    Log the request's peak RSS and observe it in timesheet_request_peak_rss_bytes;
+    for streamed bodies, once the last chunk has been sent.
+    """
+    from utils import stop_memory_tracking, observe, MEMORY_BUCKETS
+    tracking = g.memory_tracking
+    endpoint = request.endpoint or 'unknown'
+
+    def record():
+        start_rss, peak_rss = stop_memory_tracking(tracking)
+        observe('timesheet_request_peak_rss_bytes', peak_rss, MEMORY_BUCKETS, endpoint=endpoint)
+        if endpoint != 'static':
+            print(f"Memory - {endpoint}: peak RSS {peak_rss / 2**20:.0f} MB ({(peak_rss - start_rss) / 2**20:+.0f} MB)")
+
+    if response.is_streamed and not response.direct_passthrough:
+        response.call_on_close(record)
+    else:
+        record()
+    return response
+
+@app.after_request
+def _add_server_timing(response):
+    """Report the request's stages (summed per stage, in ms) in a Server-Timing header"""
+    from utils import observe
+    elapsed = time.perf_counter() - g.request_start
+    observe('timesheet_request_seconds', elapsed, endpoint=request.endpoint or 'unknown')
+
+    totals = {}
+    for stage, seconds in g.get('stage_timings', []):
+        name = re.sub(r'[^A-Za-z0-9_-]', '_', stage)
+        totals[name] = totals.get(name, 0) + seconds
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items()]
+    entries.append(f"total;dur={elapsed * 1000:.1f}")
+    response.headers['Server-Timing'] = ', '.join(entries)
+    return response
 
 # @app.route('/reset', methods=['POST'])
 # def reset():
@@ -20,15 +149,6 @@ reset_temp_directory()
 #     reset_temp_directory()  # Reset temp directory
 #     return redirect(url_for('index'))
 
-@app.before_request
-def cleanup_check():
-    """Run cleanup periodically (every hour)"""
-    from utils import should_run_cleanup, cleanup_old_files, mark_cleanup_complete
-    
-    if should_run_cleanup():
-        cleanup_old_files()
-        mark_cleanup_complete()
-
 @app.route('/temp/<path:filename>')
 def serve_temp_file(filename):
     """Serve files from temp directory"""
@@ -44,24 +164,82 @@ def serve_temp_file(filename):
 class DataNotFoundError(Exception):
     pass
 
+class InvalidUploadError(Exception):
+    pass
+
+class MemoryLimitError(Exception):
+    pass
+
+class UnknownColumnError(Exception):
+    pass
+
+# The heaviest step over raw worklogs (the detailed timesheet) allocates up to
+# about 1.5x the in-memory size of the rows it processes (see benchmarks/)
+WORKLOG_MEMORY_FACTOR = 1.5
+
+def check_memory(data, df):
+    """
+    Raise MemoryLimitError if processing `df` (a selection of the session's
+    worklogs) could take the process past the memory ceiling, even once the
+    caches have released other sessions' data.
+    """
+    from utils import memory_limit, memory_available, dataframe_bytes, reclaim_memory
+
+    if not memory_limit():
+        return
+    full = data['df']
+    required = dataframe_bytes(data['file_id'], full) * len(df) / max(len(full), 1) * WORKLOG_MEMORY_FACTOR
+    if memory_available(required):
+        return
+    # Free what this process caches for other sessions before turning the work down
+    reclaim_memory(data['file_id'])
+    if not memory_available(required):
+        raise MemoryLimitError(f"Not enough memory to process {len(df)} worklogs right now, please try again shortly")
+
+@app.errorhandler(MemoryLimitError)
+def memory_limit_exceeded(error):
+    """Reject work that could pass the memory ceiling instead of risking an OOM kill"""
+    from utils import increment
+    increment('timesheet_memory_limited_total', endpoint=request.endpoint or 'unknown', action='rejected')
+    print(f"Memory - {request.endpoint}: rejected, {error}")
+    if request.path.startswith(('/api/', '/jobs/')):
+        return jsonify({'error': str(error)}), 503, {'Retry-After': '30'}
+    return str(error), 503, {'Retry-After': '30'}
+
+@app.errorhandler(UnknownColumnError)
+def unknown_column(error):
+    """Reject a custom category the dataset does not have instead of grouping by another column"""
+    if request.path.startswith(('/api/', '/jobs/')):
+        return jsonify({'error': str(error)}), 400
+    return str(error), 400
+
 def get_session_data():
     """Get data from session and temporary storage, raising DataNotFoundError if missing."""
-    from utils import load_dataframe
+    from utils import load_dataframe, load_aggregate
     
     file_id = session.get('file_id')
     if not file_id:
         raise DataNotFoundError("No data in session")
     
-    df = load_dataframe(file_id)
+    with timed_stage('load_dataframe'):
+        df = load_dataframe(file_id)
     if df is None:
         raise DataNotFoundError("Data file not found")
     
+    # Daily aggregate cube built at upload time (rebuilt if missing)
+    with timed_stage('load_aggregate'):
+        cube = load_aggregate(file_id, 'cube')
+    if cube is None:
+        cube = build_daily_cube(df)
+    
     base_url = session.get('user_base_url', '')
     holidays = session.get('holidays', [])
     authors = session.get('user_authors', [])
     
     return {
+        'file_id': file_id,
         'df': df,
+        'cube': cube,
         'base_url': base_url,
         'holidays': holidays,
         'authors': authors
@@ -84,10 +262,475 @@ def get_local_ip():
 
 # --- Data Processing Functions ---
 
+# Repetitive text columns stored dictionary-encoded (categoricals) at upload
+COMPACT_CATEGORY_COLUMNS = ['Author', 'Issue Key', 'Parent Key', 'Labels', 'Activity',
+                            'Issue Status', 'Issue Type', 'Project Name']
+# Durations Jira exports in whole seconds
+SECONDS_COLUMNS = ['Time Spent (seconds)', 'Original Estimate (seconds)', 'Remaining Estimate (seconds)']
+
+@timed
+def compact_worklogs(df):
+    """
+    Normalize an uploaded dataset into a compact schema: categoricals for the repetitive
+    text columns and int32/int64 seconds (columns with missing or fractional values stay
+    float). Group by categorical columns with observed=True. Returns a new DataFrame.
+    """
+    df = df.copy(deep=False)
+
+    for col in COMPACT_CATEGORY_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            values = df[col]
+            # Numbers mixed into a text column (e.g. numeric labels) are kept as strings
+            if pd.api.types.infer_dtype(values, skipna=True).startswith('mixed'):
+                values = values.where(values.isna(), values.astype(str))
+            df[col] = values.astype('category')
+
+    int32 = np.iinfo(np.int32)
+    for col in SECONDS_COLUMNS:
+        if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        seconds = df[col]
+        if seconds.isna().any() or not (seconds % 1 == 0).all():
+            continue
+        fits_int32 = seconds.empty or (seconds.min() >= int32.min and seconds.max() <= int32.max)
+        df[col] = seconds.astype('int32' if fits_int32 else 'int64')
+
+    return df
+
+# Calendar columns of a day: weekday (Monday=0) and ISO year and week
+DAY_NUMBER_DTYPES = {'Weekday': 'int8', 'ISO Year': 'int16', 'ISO Week': 'int8'}
+
+def day_numbers(days):
+    """
+    DAY_NUMBER_DTYPES columns of a Series of calendar days, as compact integers
+    (nullable when some days are missing).
+    """
+    iso = days.dt.isocalendar()
+    numbers = {'Weekday': days.dt.weekday, 'ISO Year': iso['year'], 'ISO Week': iso['week']}
+    nullable = days.isna().any()
+    return {col: values.astype(DAY_NUMBER_DTYPES[col].capitalize() if nullable else DAY_NUMBER_DTYPES[col])
+            for col, values in numbers.items()}
+
+# Columns derived from each worklog's start and duration by normalize_worklogs and
+# stored with the dataset, so reports read them instead of re-parsing start dates
+WORK_DAY_COLUMNS = {'Weekday': 'Work Weekday', 'ISO Year': 'Work ISO Year', 'ISO Week': 'Work ISO Week'}
+DERIVED_COLUMNS = ['Work Date'] + list(WORK_DAY_COLUMNS.values()) + ['Work Hours']
+
+@timed
+def normalize_worklogs(df):
+    """
+    Normalize compacted worklogs once at upload (returns a new DataFrame): 'Start Date'
+    becomes local wall-clock datetimes (exports differ in how they write them) and
+    DERIVED_COLUMNS are added: the calendar 'Work Date', its weekday and ISO year and
+    week, and 'Work Hours'. Raises InvalidUploadError for unreadable start dates.
+    """
+    df = df.copy(deep=False)
+    try:
+        start = pd.to_datetime(df['Start Date'])
+    except (ValueError, TypeError) as e:
+        raise InvalidUploadError(f"Invalid Start Date values: {e}")
+    if start.dt.tz is not None:
+        start = start.dt.tz_localize(None)
+
+    df['Start Date'] = start
+    df['Work Date'] = start.dt.normalize()
+    for col, values in day_numbers(df['Work Date']).items():
+        df[WORK_DAY_COLUMNS[col]] = values
+    df['Work Hours'] = df['Time Spent (seconds)'] / 3600
+    return df
+
+def normalized(df):
+    """Worklogs with the DERIVED_COLUMNS (normalized here if they were stored without them)."""
+    return df if 'Work Date' in df.columns else normalize_worklogs(df)
+
+# Columns a Jira worklog export must have
+REQUIRED_UPLOAD_COLUMNS = ['Author', 'Start Date', 'Time Spent (seconds)', 'Issue Key']
+# Columns the reports use, read with explicit dtypes; other columns not in
+# UPLOAD_EXTRA_COLUMNS (and not Jira custom fields) are only kept if category-like
+UPLOAD_COLUMN_DTYPES = {
+    **{col: object for col in COMPACT_CATEGORY_COLUMNS},  # categorized by compact_worklogs
+    **{col: 'float64' for col in SECONDS_COLUMNS},
+    'Issue Summary': object,
+    'Parent Summary': object,
+    'Start Date': object,
+    'Comment': object,
+    'Worklog Id': object,
+    'LeaveDays': 'float64',
+}
+# Other columns kept so they can be picked as a custom category (UPLOAD_EXTRA_COLUMNS
+# in the environment adds more, comma-separated)
+UPLOAD_EXTRA_COLUMNS = ['Priority', 'Component/s', 'Components', 'Sprint', 'Fix Version/s',
+                        'Epic Link', 'Team', 'Assignee', 'Reporter', 'Resolution'] + [
+    col.strip() for col in os.environ.get('UPLOAD_EXTRA_COLUMNS', '').split(',') if col.strip()
+]
+CUSTOM_FIELD_PREFIX = 'Custom field ('
+# Any other column is read as a categorical and kept (so it can still be picked as a
+# custom category) unless it is empty or has more distinct values than this
+CUSTOM_CATEGORY_MAX_VALUES = int(os.environ.get('CUSTOM_CATEGORY_MAX_VALUES', 1000))
+
+def is_listed_upload_column(col):
+    """Whether an upload column is always kept (UPLOAD_COLUMN_DTYPES, UPLOAD_EXTRA_COLUMNS or a custom field)"""
+    return col in UPLOAD_COLUMN_DTYPES or col in UPLOAD_EXTRA_COLUMNS or col.startswith(CUSTOM_FIELD_PREFIX)
+
+def upload_columns(header):
+    """
+    Validate an upload's header and return the columns to load with their dtypes.
+    Repeated headers (Jira repeats e.g. Labels for multi-value fields) keep the first.
+    """
+    header = [str(col) for col in header]
+    missing = [col for col in REQUIRED_UPLOAD_COLUMNS if col not in header]
+    if missing:
+        raise InvalidUploadError(f"Invalid Jira export. Missing columns: {', '.join(missing)}")
+
+    dtypes = {}
+    for col in header:
+        base, _, suffix = col.rpartition('.')
+        if suffix.isdigit() and base in header:
+            continue  # renamed duplicate of an earlier column
+        if col in UPLOAD_COLUMN_DTYPES:
+            dtypes[col] = UPLOAD_COLUMN_DTYPES[col]
+        elif is_listed_upload_column(col):
+            dtypes[col] = object
+        else:
+            dtypes[col] = 'category'  # kept or dropped by keep_category_columns
+    return dtypes
+
+def keep_category_columns(df):
+    """
+    Drop the unlisted upload columns that are empty or have more than
+    CUSTOM_CATEGORY_MAX_VALUES distinct values; the rest become categoricals (with
+    numbers mixed into text kept as strings). Returns a new DataFrame.
+    """
+    df = df.copy(deep=False)
+    for col in [col for col in df.columns if not is_listed_upload_column(col)]:
+        values = df[col]
+        distinct = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values.dropna().unique()
+        if len(distinct) == 0 or len(distinct) > CUSTOM_CATEGORY_MAX_VALUES:
+            del df[col]
+            continue
+        if pd.api.types.infer_dtype(distinct, skipna=True).startswith('mixed'):
+            values = values.astype(object)
+            values = values.where(values.isna(), values.astype(str))
+        df[col] = values.astype('category')
+    return df
+
+@timed
+def read_worklog_upload(file, filename):
+    """
+    Read a Jira worklog export (CSV or Excel), loading the columns the reports use with
+    their dtypes and any other column as a categorical (see upload_columns). The header is read and validated first; CSVs are then parsed by the multi-threaded
+    Arrow reader and workbooks by openpyxl in read-only mode. Raises InvalidUploadError.
+    """
+    is_csv = filename.lower().endswith('.csv')
+    try:
+        if is_csv:
+            header = pd.read_csv(file, nrows=0).columns
+        else:
+            header = pd.read_excel(file, nrows=0).columns
+    except Exception as e:
+        raise InvalidUploadError(f"Error reading file: {e}")
+
+    dtypes = upload_columns(header)
+    file.seek(0)
+    try:
+        if is_csv:
+            df = pd.read_csv(file, engine='pyarrow', usecols=list(dtypes), dtype=dtypes)
+        else:
+            # Cells of one column can mix numbers and text, which a categorical cannot sort
+            dtypes = {col: object if dtype == 'category' else dtype for col, dtype in dtypes.items()}
+            df = pd.read_excel(file, engine='openpyxl', usecols=list(dtypes), dtype=dtypes)
+    except Exception as e:
+        raise InvalidUploadError(f"Error reading file: {e}")
+    return df
+
+def parse_worklog_file(file, filename):
+    """
+    Read an export and clean it into the compact, normalized schema used for storage
+    (whitespace-trimmed authors, derived date columns). Raises InvalidUploadError.
+    """
+    df = keep_category_columns(read_worklog_upload(file, filename))
+
+    # Clean whitespace from author names to ensure accurate filtering.
+    df['Author'] = df['Author'].str.strip()
+
+    # Compact typed schema: categoricals for repetitive text, integer seconds
+    return normalize_worklogs(compact_worklogs(df))
+
+# Column recording which uploaded file each worklog came from (multi-file uploads)
+SOURCE_FILE_COLUMN = 'Source File'
+
+@timed
+def merge_worklog_uploads(frames, filenames):
+    """
+    Merge parsed exports into one dataset tagged with each worklog's source file.
+    Columns missing from an export are left empty, except that an export with only
+    one of Activity and Labels fills the other from it.
+    """
+    from utils import concat_frames
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns)) + [SOURCE_FILE_COLUMN]
+
+    aligned = []
+    for frame, filename in zip(frames, filenames):
+        frame = frame.copy(deep=False)
+        for col, other in (('Activity', 'Labels'), ('Labels', 'Activity')):
+            if col in columns and col not in frame.columns and other in frame.columns:
+                frame[col] = frame[other]
+        frame[SOURCE_FILE_COLUMN] = pd.Categorical([filename] * len(frame))
+        aligned.append(frame.reindex(columns=columns))
+
+    # A column categorical in any export is categorical in all of them
+    for col in columns:
+        if any(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in aligned):
+            for frame in aligned:
+                if not isinstance(frame[col].dtype, pd.CategoricalDtype):
+                    frame[col] = frame[col].astype('category')
+    return concat_frames(aligned)
+
+def read_worklog_uploads(files):
+    """
+    Parse several uploaded exports concurrently in the export pool and merge them
+    into one dataset (see merge_worklog_uploads). Raises InvalidUploadError.
+    """
+    from utils import get_export_pool
+    filenames = [file.filename for file in files]
+    futures = [get_export_pool().submit(parse_worklog_file, BytesIO(file.read()), filename)
+               for file, filename in zip(files, filenames)]
+
+    frames = []
+    for future, filename in zip(futures, filenames):
+        try:
+            frames.append(future.result())
+        except InvalidUploadError as e:
+            raise InvalidUploadError(f"{filename}: {e}")
+    return merge_worklog_uploads(frames, filenames)
+
+# Category columns kept as dimensions of the daily aggregate cube
+CUBE_CATEGORY_COLUMNS = ['Activity', 'Labels']
+
+@timed
+def build_daily_cube(df, category_columns=None):
+    """
+    Aggregate normalized worklogs into one row per Author, calendar day and category.
+    Holds 'Hours' (exact) and 'Rounded Hours' (sum of per-worklog hours rounded to
+    2 decimals, as shown in the detailed timesheet), plus 'LeaveDays' if present,
+    and each day's DAY_NUMBER_DTYPES columns.
+    """
+    if category_columns is None:
+        category_columns = CUBE_CATEGORY_COLUMNS
+    category_columns = [col for col in dict.fromkeys(category_columns)
+                        if col in df.columns and col not in ('Author', 'Date', *DAY_NUMBER_DTYPES)]
+
+    df = normalized(df)
+    hours = df['Work Hours']
+    cube = pd.DataFrame({
+        'Author': df['Author'],
+        'Date': df['Work Date'],
+    })
+    for col in category_columns:
+        cube[col] = df[col]
+    cube['Hours'] = hours
+    cube['Rounded Hours'] = hours.round(2)
+
+    aggregations = {'Hours': 'sum', 'Rounded Hours': 'sum'}
+    if 'LeaveDays' in df.columns:
+        cube['LeaveDays'] = df['LeaveDays']
+        aggregations['LeaveDays'] = 'max'
+
+    cube = cube.groupby(['Author', 'Date'] + category_columns, dropna=False, observed=True, as_index=False).agg(aggregations)
+    for col, values in day_numbers(cube['Date']).items():
+        cube[col] = values
+    return cube
+
+def is_daily_cube(df):
+    """True if df holds hours per Author and day (the cube) rather than raw worklogs."""
+    return 'Time Spent (seconds)' not in df.columns and 'Hours' in df.columns
+
+def merge_daily_cubes(cube, delta):
+    """Add the daily cube of newly appended worklogs to a stored cube."""
+    from utils import concat_frames
+    aggregations = {'Hours': 'sum', 'Rounded Hours': 'sum'}
+    if 'LeaveDays' in cube.columns:
+        aggregations['LeaveDays'] = 'max'
+    keys = [col for col in cube.columns if col not in aggregations]
+
+    combined = concat_frames([cube, delta[cube.columns]])
+    return combined.groupby(keys, dropna=False, observed=True, as_index=False).agg(aggregations)
+
+# Fields that identify a worklog in exports without a Worklog Id
+WORKLOG_KEY_COLUMNS = ['Author', 'Start Date', 'Issue Key', 'Time Spent (seconds)', 'Comment']
+
+def worklog_keys(df, by_id=True):
+    """
+    Identity of each worklog, used to skip worklogs already stored when appending an
+    export: the Worklog Id, or a hash of WORKLOG_KEY_COLUMNS when by_id is False.
+    """
+    if by_id:
+        # Ids are read as floats when some are missing ('10002770.0'): compare numbers as integers
+        ids = df['Worklog Id']
+        numbers = pd.to_numeric(ids, errors='coerce')
+        integral = numbers.notna() & (numbers % 1 == 0)
+        keys = ids.astype(str)
+        keys[integral] = numbers[integral].astype('int64').astype(str)
+        return keys
+    columns = [col for col in WORKLOG_KEY_COLUMNS if col in df.columns]
+    values = df[columns].astype({col: 'float64' for col in columns if pd.api.types.is_numeric_dtype(df[col])})
+    # Start dates may be strings, Timestamps or datetimes depending on how they were read
+    values['Start Date'] = pd.to_datetime(values['Start Date'], utc=True).astype('datetime64[ns, UTC]')
+    return pd.util.hash_pandas_object(values, index=False)
+
+def worklog_key_table(df):
+    """
+    Both worklog_keys of each worklog, stored with a dataset as its 'keys' aggregate:
+    'Id' (when the data has a Worklog Id column) and 'Hash'.
+    """
+    keys = pd.DataFrame({'Hash': worklog_keys(df, by_id=False).to_numpy()})
+    if 'Worklog Id' in df.columns:
+        keys['Id'] = worklog_keys(df).to_numpy()
+    return keys
+
+def conform_worklogs(df, schema):
+    """
+    Align new worklogs with a stored dataset's columns: missing ones are added empty
+    and ones the dataset doesn't have are dropped.
+    """
+    df = df.reindex(columns=schema.columns)
+    for col in schema.columns:
+        if isinstance(schema[col].dtype, pd.CategoricalDtype) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+@timed
+def append_worklogs(data, delta):
+    """
+    Append a (compacted) delta export to the session dataset. Worklogs whose keys are
+    in the dataset's stored key table are skipped; the new rows are written as a part
+    file next to the dataset and folded into the stored daily cube and key table.
+    Returns the rows that were added.
+    """
+    from utils import append_dataframe, save_aggregate, load_aggregate
+    df = data['df']
+    delta = conform_worklogs(delta, df)
+
+    # Datasets stored without a key table (e.g. before it existed) are hashed once
+    stored_keys = load_aggregate(data['file_id'], 'keys')
+    if stored_keys is None:
+        stored_keys = worklog_key_table(df)
+
+    by_id = 'Id' in stored_keys.columns and delta['Worklog Id'].notna().all()
+    keys = worklog_keys(delta, by_id)
+    new_rows = delta[~keys.isin(stored_keys['Id' if by_id else 'Hash']) & ~keys.duplicated()].reset_index(drop=True)
+    if new_rows.empty:
+        return new_rows
+
+    category_columns = [col for col in data['cube'].columns if col in CUBE_CATEGORY_COLUMNS]
+    append_dataframe(data['file_id'], new_rows)
+    save_aggregate(data['file_id'], 'keys', pd.concat([stored_keys, worklog_key_table(new_rows)], ignore_index=True))
+    save_aggregate(data['file_id'], 'cube', merge_daily_cubes(data['cube'], build_daily_cube(new_rows, category_columns)))
+    return new_rows
+
+def daily_author_hours(df):
+    """
+    Hours logged per Author and calendar day (with the day's DAY_NUMBER_DTYPES
+    columns), from raw worklogs or the daily cube.
+    """
+    cube = df if is_daily_cube(df) else build_daily_cube(df, [])
+    # The day's numbers are the same on all of its rows
+    aggregations = {'Hours': 'sum', **{col: 'first' for col in DAY_NUMBER_DTYPES}}
+    return cube.groupby(['Author', 'Date'], observed=True, as_index=False).agg(aggregations)
+
+def holiday_dates(holidays):
+    """Holidays ('YYYY-MM-DD' strings) as datetimes, skipping malformed ones."""
+    return pd.to_datetime(pd.Series(holidays, dtype=object), format='%Y-%m-%d', errors='coerce').dropna()
+
+def check_category_column(df, category_type):
+    """Raise UnknownColumnError if a custom category_type is not a column of the dataset."""
+    if category_type in ('Activity', 'Label') or category_type in df.columns:
+        return
+    if category_type == 'Custom':
+        raise UnknownColumnError("Enter the name of a column for the custom category")
+    raise UnknownColumnError(f"Column '{category_type}' is not in the uploaded data, so the report cannot be grouped by it")
+
+def resolve_category_column(columns, category_type):
+    """Column used as the category for a category_type selection, or None for 'General'."""
+    if category_type == "Activity" and 'Activity' in columns:
+        return 'Activity'
+    elif category_type == "Label" and 'Labels' in columns:
+        return 'Labels'
+    elif category_type in columns:
+        return category_type  # Custom column selection
+    elif 'Labels' in columns:
+        return 'Labels'  # Fallback to Labels if available
+    elif 'Activity' in columns:
+        return 'Activity'  # Fallback to Activity if available
+    return None
+
+@timed
+def calculate_category_totals(df, category_type="Activity"):
+    """Total hours per category, with empty categories grouped last as 'No Label/Empty'."""
+    if df.empty:
+        return pd.DataFrame()
+
+    category_col = resolve_category_column(df.columns, category_type)
+    cube = df if is_daily_cube(df) else build_daily_cube(df, [category_col] if category_col else [])
+
+    if category_col:
+        categories = cube[category_col].astype(object).fillna('No Label/Empty')
+        categories[categories.astype(str).str.strip() == ''] = 'No Label/Empty'
+    else:
+        categories = pd.Series('General', index=cube.index)
+
+    category_totals = cube.groupby(categories.rename('Category'), observed=True)['Rounded Hours'].sum().round(2).reset_index()
+    category_totals.columns = ['Category', 'Hours spent']
+
+    # Sort to put 'No Label/Empty' second to last, before total
+    if 'No Label/Empty' in category_totals['Category'].values:
+        no_label_row = category_totals[category_totals['Category'] == 'No Label/Empty']
+        other_rows = category_totals[category_totals['Category'] != 'No Label/Empty']
+        category_totals = pd.concat([other_rows, no_label_row], ignore_index=True)
+
+    return category_totals
+
+def format_datetimes(values, fmt):
+    """
+    Series.dt.strftime that formats each distinct value only once (NaT becomes NaN).
+    Pass values reduced to what the format shows, e.g. calendar days for dates.
+    """
+    codes, uniques = pd.factorize(values)
+    formatted = np.asarray(pd.DatetimeIndex(uniques).strftime(fmt), dtype=object)
+    result = formatted.take(codes) if len(formatted) else np.empty(len(codes), dtype=object)
+    result[codes < 0] = np.nan
+    return pd.Series(result, index=values.index)
+
+def clock_times(values):
+    """Time of day of datetimes at minute precision, placed on a fixed date."""
+    return pd.Timestamp(0) + (values.dt.floor('min') - values.dt.normalize())
+
+@timed
 def process_timesheet(df, base_url, category_type="Activity", working_days=None, holidays=None):
+    """
+    Build the detailed timesheet (one row per worklog, plus non-working and leave days
+    without any work) and the category totals. Works on whole columns at once and keeps
+    dates as datetimes until they are formatted for export; the input is not modified.
+    Holiday/Leave highlighting is applied when writing the workbook (write_timesheet_workbook).
+    """
     if df.empty:
         return pd.DataFrame(), pd.DataFrame()
-    
+
+    output_df = next(timesheet_chunks(df, base_url, category_type, working_days))
+    category_totals = calculate_category_totals(df, category_type)
+
+    return output_df, category_totals
+
+def timesheet_chunks(df, base_url, category_type="Activity", working_days=None, chunk_rows=None):
+    """
+    Yield the detailed timesheet rows of process_timesheet in order, chunk_rows at a time
+    (all in one DataFrame by default). Rows are ordered once up front from their start
+    times; the text columns are only built for the chunk being yielded.
+    """
+    if df.empty:
+        yield pd.DataFrame()
+        return
+
     if working_days is None:
         working_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
     
@@ -98,189 +741,99 @@ def process_timesheet(df, base_url, category_type="Activity", working_days=None,
     }
     working_day_nums = [day_name_to_num[day] for day in working_days if day in day_name_to_num]
     
-    df['Start Date'] = pd.to_datetime(df['Start Date']).dt.tz_localize(None)
-    df['Time'] = df['Start Date'].apply(lambda x: 'FullDay' if x.weekday() in working_day_nums else 'Holiday')
-    
-    # Create Hours column from Time Spent (seconds)
-    df['Hours'] = df['Time Spent (seconds)'] / 3600
-    
-    # Group by date and sum hours
-    daily_hours = df.groupby('Start Date')['Hours'].sum().reset_index()
-    daily_hours['Hours'] = daily_hours['Hours'].round(2)
-    
-    # Get date range
-    start_date = df['Start Date'].min()
-    end_date = df['Start Date'].max()
-    all_dates = pd.date_range(start=start_date, end=end_date, freq='D')
-    
-    # Create a complete date range DataFrame
-    complete_dates = pd.DataFrame({'Start Date': all_dates})
-    complete_dates['weekday'] = complete_dates['Start Date'].dt.weekday
-    
-    # Identify non-working days and working days
-    non_working_days = all_dates[~all_dates.weekday.isin(working_day_nums)]
-    working_days_dates = all_dates[all_dates.weekday.isin(working_day_nums)]
-    # Add: Identify holidays in the date range
-    holiday_days = pd.to_datetime(list(holidays)) if holidays else pd.DatetimeIndex([])
-    
-    # Get all dates from original data (including 0-hour entries) and actual work dates with hours > 0
-    all_logged_dates = set(df['Start Date'].unique())
-    actual_work_dates = set(daily_hours[daily_hours['Hours'] > 0]['Start Date'])
-    
-    # Detect leave days: working days with no logged entries between first and last logged dates
-    if len(all_logged_dates) > 1:
-        first_logged_date = min(all_logged_dates)
-        last_logged_date = max(all_logged_dates)
-        
-        # Find working days between first and last logged date that have no entries at all
-        potential_leave_dates = working_days_dates[
-            (working_days_dates >= first_logged_date) & 
-            (working_days_dates <= last_logged_date) &
-            (~working_days_dates.isin(all_logged_dates))
-        ]
-    else:
-        potential_leave_dates = pd.DatetimeIndex([])
-    
-    # Merge with actual data
-    result = complete_dates.merge(daily_hours, on='Start Date', how='left')
-    result['Hours'] = result['Hours'].fillna(0)
-    
-    # Add category and styling information with leave detection and holiday
-    def categorize_day(row):
-        date = row['Start Date']
-        hours = row['Hours']
-        date_str = date.strftime('%Y-%m-%d')
-        if date in non_working_days:
-            return 'Non-Working Day'
-        elif date in holiday_days:
-            return 'Holiday'
-        elif date in potential_leave_dates:
-            return 'Leave'
-        elif hours > 0:
-            return 'Work'
-        else:
-            return 'No Work'
+    df = normalized(df)
+    day = df['Work Date']
     
-    result['Category'] = result.apply(categorize_day, axis=1)
+    # Calendar between the first and last logged day, split into working and non-working days
+    all_dates = pd.date_range(start=day.min(), end=day.max(), freq='D')
+    is_working_day = all_dates.weekday.isin(working_day_nums)
+    # Only days without any work logged get their own Holiday/Leave row
+    without_work = ~all_dates.isin(day)
+    non_working_days_without_work = all_dates[~is_working_day & without_work]
+    actual_leave_dates = all_dates[is_working_day & without_work]
     
-    result['Link'] = result.apply(lambda row: 
-        f'<a href="{base_url}&date_filter={row["Start Date"].strftime("%Y-%m-%d")}" target="_blank">{row["Hours"]}</a>' 
-        if row['Hours'] > 0 else str(row['Hours']), axis=1)
-    
-    # Format the date for display
-    result['Date'] = result['Start Date'].dt.strftime('%d/%b/%Y')
-    result['Time'] = result.apply(lambda row: 
-        'FullDay' if row['Category'] == 'Work' else 
-        ('Holiday' if row['Category'] == 'Non-Working Day' else 
-         ('Leave' if row['Category'] == 'Leave' else 'No Work')), axis=1)
-    
-    # Create detailed timesheet from original data
-    df['Date'] = df['Start Date'].dt.strftime('%d/%b/%Y')
-    df['Ticket/Task #'] = df['Issue Key'].apply(lambda x: f"{base_url}{x}")
-    df['Hours spent'] = df['Time Spent (seconds)'].apply(lambda x: round(x / 3600, 2))
-    df['Start Time'] = df['Start Date'].dt.strftime('%I:%M %p')
-    df['End Time'] = (df['Start Date'] + pd.to_timedelta(df['Time Spent (seconds)'], unit='s')).dt.strftime('%I:%M %p')
-    df['Status'] = df['Issue Status']
-    df['Application/Project Name'] = df['Project Name']
-    df['Activity/Task Done'] = df['Comment']
-    
-    # Category driven by radio button selection with fallback
-    if category_type == "Activity" and 'Activity' in df.columns:
-        df['Category'] = df['Activity']
-    elif category_type == "Label" and 'Labels' in df.columns:
-        df['Category'] = df['Labels']
-    elif category_type in df.columns:
-        df['Category'] = df[category_type]  # Custom column selection
-    elif 'Labels' in df.columns:
-        df['Category'] = df['Labels']  # Fallback to Labels if available
-    elif 'Activity' in df.columns:
-        df['Category'] = df['Activity']  # Fallback to Activity if available
-    else:
-        df['Category'] = 'General'  # Default category if neither exists
-    df['Remarks for any additional information'] = ""
+    category_col = resolve_category_column(df.columns, category_type)
 
-    # Add non-working days to the detailed timesheet (only for dates without any work logged)
-    non_working_days_without_work = non_working_days[~non_working_days.strftime('%d/%b/%Y').isin(df['Date'].unique())]
+    # Non-working days (only for dates without any work logged)
     non_working_df = pd.DataFrame({
         'Time': 'Holiday',
         'Date': non_working_days_without_work.strftime('%d/%b/%Y'),
         'Application/Project Name': '',
         'Activity/Task Done': '',
-        'Hours spent': 0,
+        'Hours spent': 0.0,
         'Category': 'Non-Working Day',
         'Ticket/Task #': '',
         'Start Time': '12:00 AM',
         'End Time': '',
         'Remarks for any additional information': '',
-        'Status': ''
+        'Status': '',
     })
     
-    # Add leave days to the detailed timesheet (only for dates that have no work entries at all)
-    # Filter out any potential leave dates that actually have work logged
-    actual_leave_dates = potential_leave_dates[~potential_leave_dates.strftime('%d/%b/%Y').isin(df['Date'].unique())]
+    # Leave days (only for dates that have no work entries at all)
     leave_df = pd.DataFrame({
         'Time': 'Leave',
         'Date': actual_leave_dates.strftime('%d/%b/%Y'),
         'Application/Project Name': '',
         'Activity/Task Done': 'Leave Day',
-        'Hours spent': 0,
+        'Hours spent': 0.0,
         'Category': 'Leave',
         'Ticket/Task #': '',
         'Start Time': '12:00 AM',
         'End Time': '',
         'Remarks for any additional information': '',
-        'Status': ''
+        'Status': '',
     })
+    days_without_work = pd.concat([non_working_df, leave_df], ignore_index=True)
+
+    # Worklogs are ordered by their start time at minute precision; rows 0..n-1 are the
+    # worklogs and the rest the days without work, as placed on their dates
+    n = len(df)
+    order = pd.Series(np.concatenate([
+        df['Start Date'].dt.floor('min').to_numpy(),
+        non_working_days_without_work.to_numpy(),
+        actual_leave_dates.to_numpy(),
+    ])).sort_values().index.to_numpy()
+
+    # Columns the rows are built from, taken for one chunk at a time
+    columns = [df.columns.get_loc(col) for col in dict.fromkeys([
+        'Start Date', 'Time Spent (seconds)', 'Work Date', 'Work Weekday', 'Work Hours',
+        'Project Name', 'Comment', 'Issue Key', 'Issue Status'] + ([category_col] if category_col else []))]
+    chunk_rows = chunk_rows or len(order)
+    for begin in range(0, len(order), chunk_rows):
+        positions = order[begin:begin + chunk_rows]
+        logged = positions[positions < n]
+        rows = df.iloc[logged, columns]
+        start = rows['Start Date']
+        end = start + pd.to_timedelta(rows['Time Spent (seconds)'], unit='s')
+
+        # Detailed timesheet rows from the original data
+        worklogs_df = pd.DataFrame({
+            'Time': np.where(rows['Work Weekday'].isin(working_day_nums), 'FullDay', 'Holiday'),
+            'Date': format_datetimes(rows['Work Date'], '%d/%b/%Y'),
+            'Application/Project Name': rows['Project Name'],
+            'Activity/Task Done': rows['Comment'],
+            'Hours spent': rows['Work Hours'].round(2),
+            # Category driven by radio button selection with fallback
+            'Category': rows[category_col] if category_col else 'General',
+            'Ticket/Task #': base_url + rows['Issue Key'].astype(str),
+            'Start Time': format_datetimes(clock_times(start), '%I:%M %p'),
+            'End Time': format_datetimes(clock_times(end), '%I:%M %p'),
+            'Remarks for any additional information': "",
+            'Status': rows['Issue Status'],
+        })
 
-    output_df = pd.concat([df, non_working_df, leave_df], ignore_index=True)
-    output_df['DateTime'] = pd.to_datetime(output_df['Date'] + ' ' + output_df['Start Time'],
-                                           format='%d/%b/%Y %I:%M %p', errors='coerce')
-
-
-    output_columns = [
-        'Time', 'Date', 'Application/Project Name', 'Activity/Task Done', 'Hours spent',
-        'Category', 'Ticket/Task #', 'Start Time', 'End Time', 'Remarks for any additional information', 'Status'
-    ]
-
-    output_df = output_df[output_columns + ['DateTime']]
-    output_df = output_df.sort_values(by='DateTime', ascending=True).drop(columns=['DateTime'])
-
-    # Handle empty/null categories
-    df['Category'] = df['Category'].fillna('No Label/Empty')
-    df.loc[df['Category'].str.strip() == '', 'Category'] = 'No Label/Empty'
-    
-    category_totals = df.groupby('Category')['Hours spent'].sum().reset_index()
-    
-    # Sort to put 'No Label/Empty' second to last, before total
-    if 'No Label/Empty' in category_totals['Category'].values:
-        no_label_row = category_totals[category_totals['Category'] == 'No Label/Empty']
-        other_rows = category_totals[category_totals['Category'] != 'No Label/Empty']
-        category_totals = pd.concat([other_rows, no_label_row], ignore_index=True)
-
-    def highlight_non_working_days(val):
-        """
-        Highlight non-working days in yellow and leave days in light orange
-        """
-        if val == 'Non-Working Day':
-            return 'background-color: yellow'
-        elif val == 'Leave':
-            return 'background-color: #ffcc99'  # Light orange for leave days
-        return ''
-
-    def highlight_holiday_rows(row):
-        """
-        Highlight entire row yellow when Time field is 'Holiday'
-        """
-        if row['Time'] == 'Holiday':
-            return ['background-color: yellow'] * len(row)
-        elif row['Time'] == 'Leave':
-            return ['background-color: #ffcc99'] * len(row)
+        # Interleave the days without work with the worklogs (each already in order)
+        is_day = positions >= n
+        if is_day.any():
+            parts = [part for part in (worklogs_df, days_without_work.iloc[positions[is_day] - n]) if len(part)]
+            taken = np.empty(len(positions), dtype=np.intp)
+            taken[~is_day] = np.arange(len(logged))
+            taken[is_day] = np.arange(len(logged), len(positions))
+            chunk = (pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]).take(taken)
         else:
-            return [''] * len(row)
-
-    styled_df = output_df.style.apply(highlight_holiday_rows, axis=1)
-
-    return styled_df, category_totals
+            chunk = worklogs_df
+        chunk.index = positions
+        yield chunk
 
 # def calculate_weekly_overtime(df, working_hours=8, working_days=None, holidays=None):
 #     """Calculate weekly overtime hours for chart visualization"""
@@ -366,6 +919,71 @@ def process_timesheet(df, base_url, category_type="Activity", working_days=None,
 #         'date_ranges': [item['date_range'] for item in weekly_data]
 #     }
 
+# Overtime components computed per Author and day by compute_overtime
+OVERTIME_COMPONENTS = ['weekend_hours', 'holiday_overtime', 'daily_overtime']
+
+def compute_overtime(df, working_hours=8, working_days=None, holidays=None):
+    """
+    Overtime engine shared by every overtime panel and the burnout score.
+    Returns one row per Author and calendar day (from raw worklogs or the daily cube)
+    with the day's Hours and its weekend, holiday and beyond-working-hours overtime.
+    """
+    if working_days is None:
+        working_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+    if holidays is None:
+        holidays = []
+
+    day_name_to_num = {
+        'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+        'Friday': 4, 'Saturday': 5, 'Sunday': 6
+    }
+    working_day_nums = [day_name_to_num[day] for day in working_days if day in day_name_to_num]
+
+    overtime = daily_author_hours(df)
+    is_working_day = overtime['Weekday'].isin(working_day_nums)
+    is_holiday = overtime['Date'].isin(holiday_dates(holidays))
+
+    # Work on non-working days and holidays is overtime in full (a holiday on a
+    # non-working day counts for both); on other days only hours beyond working_hours
+    overtime['weekend_hours'] = overtime['Hours'].where(~is_working_day, 0.0)
+    overtime['holiday_overtime'] = overtime['Hours'].where(is_holiday, 0.0)
+    overtime['daily_overtime'] = (overtime['Hours'] - working_hours).clip(lower=0).where(is_working_day & ~is_holiday, 0.0)
+    return overtime
+
+def overtime_by_author(overtime, leave_days=0, working_hours=8):
+    """Overtime components and total per author (indexed by Author), rounded to 2 decimals."""
+    per_author = overtime.groupby('Author', observed=True)[OVERTIME_COMPONENTS].sum()
+    per_author['leave_overtime'] = float(leave_days * working_hours)
+    per_author['total_overtime'] = per_author[OVERTIME_COMPONENTS + ['leave_overtime']].sum(axis=1)
+    return per_author.round(2)
+
+def summarize_overtime(per_author):
+    """
+    Overtime summary dict from overtime_by_author: the author's own figures when there
+    is only one author, otherwise the components summed across authors.
+    """
+    if len(per_author) == 1:
+        author = per_author.index[0]
+        row = per_author.iloc[0]
+        return {
+            'author': author,
+            'weekend_hours': float(row['weekend_hours']),
+            'holiday_overtime': float(row['holiday_overtime']),
+            'daily_overtime': float(row['daily_overtime']),
+            'leave_overtime': float(row['leave_overtime']),
+            'total_overtime': float(row['total_overtime'])
+        }
+
+    total_overtime = {
+        'weekend_hours': round(float(per_author['weekend_hours'].sum()), 2),
+        'holiday_overtime': round(float(per_author['holiday_overtime'].sum()), 2),
+        'daily_overtime': round(float(per_author['daily_overtime'].sum()), 2),
+        'leave_overtime': round(float(per_author['leave_overtime'].sum()), 2)
+    }
+    total_overtime['total_overtime'] = round(sum(total_overtime.values()), 2)
+    return total_overtime
+
+@timed
 def calculate_weekly_overtime(df, working_hours=8, working_days=None, holidays=None, author_filter="All"):
     """Calculate weekly overtime hours and total efforts for chart visualization"""
 
@@ -377,59 +995,36 @@ def calculate_weekly_overtime(df, working_hours=8, working_days=None, holidays=N
     if holidays is None:
         holidays = []
 
-    # Ensure datetime & hours
-    df['Start Date'] = pd.to_datetime(df['Start Date']).dt.tz_localize(None)
-    df['Hours spent'] = df['Time Spent (seconds)'] / 3600
-    df['Week_Start'] = df['Start Date'].dt.to_period('W').apply(lambda r: r.start_time)
-    df['Week_End'] = df['Start Date'].dt.to_period('W').apply(lambda r: r.end_time)
-    df['Week_Number'] = df['Start Date'].dt.isocalendar().week
-    df['Year'] = df['Start Date'].dt.isocalendar().year
-    df['WeekKey'] = df['Year'].astype(str) + '-W' + df['Week_Number'].astype(str).str.zfill(2)
-
     # Author filter
     if author_filter != "All":
         df = df[df['Author'] == author_filter]
 
-    weekly_data = []
-
-    # Group week by week
-    for (week_key, week_start, week_end), week_df in df.groupby(['WeekKey', 'Week_Start', 'Week_End']):
-        # Calculate total hours for the week
-        total_hours = week_df['Hours spent'].sum()
-        
-        # Calculate overtime hours
-        overtime_summary = calculate_overtime_hours(
-            week_df,
-            leave_days=0,
-            holiday_days=0,
-            working_hours=working_hours,
-            working_days=working_days,
-            holidays=holidays
-        )
+    # Overtime per Author and calendar day from the shared engine
+    df = compute_overtime(df, working_hours, working_days, holidays)
 
-        total_overtime = overtime_summary['total_overtime']
-        actual_hours = total_hours - total_overtime
-
-        # Include all weeks with any hours worked
-        if total_hours > 0:
-            date_range = f"{week_start.strftime('%d/%m/%Y')} - {week_end.strftime('%d/%m/%Y')}"
-            weekly_data.append({
-                'week': week_key,
-                'overtime_hours': round(total_overtime, 2),
-                'total_hours': round(total_hours, 2),
-                'actual_hours': round(max(0, actual_hours), 2),
-                'date_range': date_range
-            })
+    # Bucket days into Monday-Sunday weeks keyed by ISO year and week, then total
+    # hours and overtime for every week in one grouped pass
+    days = pd.DataFrame({
+        'WeekKey': df['ISO Year'].astype(str) + '-W' + df['ISO Week'].astype(str).str.zfill(2),
+        'Week_Start': df['Date'] - pd.to_timedelta(df['Weekday'], unit='D'),
+        'Hours': df['Hours'],
+        'Overtime': df[OVERTIME_COMPONENTS].sum(axis=1),
+    })
+    weekly = days.groupby(['WeekKey', 'Week_Start'], observed=True, as_index=False)[['Hours', 'Overtime']].sum()
 
-    # Sort by week
-    weekly_data.sort(key=lambda x: x['week'])
+    # Include all weeks with any hours worked, sorted by week
+    weekly = weekly[weekly['Hours'] > 0].sort_values('WeekKey')
+    overtime_hours = weekly['Overtime'].round(2)
+    actual_hours = (weekly['Hours'] - overtime_hours).clip(lower=0).round(2)
+    week_end = weekly['Week_Start'] + pd.Timedelta(days=6)
+    date_ranges = format_datetimes(weekly['Week_Start'], '%d/%m/%Y') + ' - ' + format_datetimes(week_end, '%d/%m/%Y')
 
     return {
-        'weeks': [item['week'] for item in weekly_data],
-        'overtime_hours': [item['overtime_hours'] for item in weekly_data],
-        'total_hours': [item['total_hours'] for item in weekly_data],
-        'actual_hours': [item['actual_hours'] for item in weekly_data],
-        'date_ranges': [item['date_range'] for item in weekly_data]
+        'weeks': weekly['WeekKey'].tolist(),
+        'overtime_hours': overtime_hours.tolist(),
+        'total_hours': weekly['Hours'].round(2).tolist(),
+        'actual_hours': actual_hours.tolist(),
+        'date_ranges': date_ranges.tolist()
     }
 
 
@@ -446,50 +1041,88 @@ def calculate_weekly_overtime_for_author(df, working_hours=8, working_days=None,
     if holidays is None:
         holidays = []
     
-    overtime_per_author = {}
-    for author in df['Author'].unique():
-        author_df = df[df['Author'] == author]
-        
-        # Calculate detailed overtime using existing function
-        overtime_data = calculate_overtime_hours(
-            author_df, 0, 0, working_hours, working_days, holidays
-        )
-        
-        total_overtime = overtime_data['total_overtime']
-        overtime_per_author[author] = max(0, total_overtime)  # Ensure overtime is not negative
+    per_author = overtime_by_author(compute_overtime(df, working_hours, working_days, holidays), 0, working_hours)
+    overtime_per_author = per_author['total_overtime'].clip(lower=0).to_dict()  # Ensure overtime is not negative
         
     return overtime_per_author
 
 
 def update_burnout_risk_scores(current_df, historical_scores=None, smoothing_factor=0.4, working_hours=8, working_days=None, holidays=None):
     """
-    Updates the burnout risk scores based on the current data and historical scores using EMA.
+    Updates the burnout risk scores with an EMA over each author's weekly overtime.
+    Scores resume from each author's last stored week, so only that week and later ones are
+    folded in and written back to the score store. When historical_scores is given,
+    authors are seeded from it instead and the store is left untouched.
     Returns the updated scores and a list of current burnout cases.
     """
+    from utils import load_burnout_scores, save_burnout_scores
+
     if current_df.empty:
         return {}, []
     
+    # 1. Calculate overtime for the current period (one pass over all authors)
+    overtime = compute_overtime(current_df, working_hours, working_days, holidays)
+    if overtime.empty:
+        return dict(historical_scores or {}), []
+    per_author = overtime_by_author(overtime, 0, working_hours)
+    hours_by_author = overtime.groupby('Author', observed=True)['Hours'].sum()
+    current_overtime = per_author['total_overtime'].clip(lower=0).to_dict()
+
+    # 2. Weekly overtime per author on a Monday-based grid covering the upload;
+    # weeks an author logged nothing count as zero overtime
+    overtime['Week_Start'] = overtime['Date'] - pd.to_timedelta(overtime['Weekday'], unit='D')
+    overtime['Overtime'] = overtime[OVERTIME_COMPONENTS].sum(axis=1).clip(lower=0)
+    weekly = overtime.pivot_table(index='Week_Start', columns='Author', values='Overtime', aggfunc='sum', fill_value=0.0, observed=True)
+    weekly = weekly.reindex(pd.date_range(weekly.index.min(), weekly.index.max(), freq='7D'), fill_value=0.0)
+    weekly = weekly.rename_axis(index='Week_Start', columns='Author').stack().rename('Overtime').reset_index()
+    weekly['Author'] = weekly['Author'].astype(object)
+
+    # 3. Previous score per author and the last week it covers. That week may have been
+    # partial when stored, so it is recomputed from the score going into it if present
     if historical_scores is None:
-        historical_scores = {}
-    
-    # 1. Calculate overtime for the current period
-    current_overtime = calculate_weekly_overtime_for_author(current_df, working_hours, working_days, holidays)
-    
-    updated_scores = historical_scores.copy()
-    all_authors = set(list(historical_scores.keys()) + list(current_overtime.keys()))
+        stored = load_burnout_scores(weekly['Author'].unique()).set_index('author')
+        last_week = pd.to_datetime(stored['week_start'])
+        redo_last_week = last_week.isin(weekly['Week_Start'])
+        previous_scores = stored['score'].where(~redo_last_week, stored['previous_score']).astype(float)
+        covered_until = weekly['Author'].map(last_week)
+        weekly = weekly[covered_until.isna() | (weekly['Week_Start'] >= covered_until)]
+    else:
+        previous_scores = pd.Series(historical_scores, dtype=float)
+
+    # 4. EMA over the new weeks in one grouped pass: each author's series starts with a
+    # seed row holding the previous score, so the first new week blends into it
+    authors = weekly['Author'].unique()
+    seeds = pd.DataFrame({
+        'Author': authors,
+        'Week_Start': pd.NaT,
+        'Overtime': previous_scores.reindex(authors).fillna(0.0).to_numpy(),
+    })
+    series = pd.concat([seeds, weekly], ignore_index=True)
+    series = series.sort_values(['Author', 'Week_Start'], na_position='first', kind='stable')
+    series['Score'] = (
+        series.groupby('Author', sort=False, observed=True)['Overtime']
+        .ewm(alpha=smoothing_factor, adjust=False).mean()
+        .reset_index(level=0, drop=True)
+    )
+    new_weeks = series[series['Week_Start'].notna()]
+
+    if historical_scores is None:
+        save_burnout_scores(pd.DataFrame({
+            'author': new_weeks['Author'],
+            'week_start': format_datetimes(new_weeks['Week_Start'], '%Y-%m-%d'),
+            'overtime': new_weeks['Overtime'],
+            'score': new_weeks['Score'],
+        }))
+
+    updated_scores = previous_scores.to_dict()
+    updated_scores.update(new_weeks.groupby('Author', sort=False, observed=True)['Score'].last().to_dict())
 
     burnout_cases = []
 
-    for author in all_authors:
-        # 2. Get previous score and current overtime
-        previous_score = historical_scores.get(author, 0)
+    for author, new_score in updated_scores.items():
         current_overtime_hours = current_overtime.get(author, 0)  # 0 overtime if they didn't log time
 
-        # 3. Apply the EMA formula to calculate the new score
-        new_score = (current_overtime_hours * smoothing_factor) + (previous_score * (1 - smoothing_factor))
-        updated_scores[author] = new_score
-
-        # 4. Determine burnout level based on the NEW score and thresholds
+        # 5. Determine burnout level based on the NEW score and thresholds
         burnout_level = "Low"
         message = ""
         
@@ -505,12 +1138,9 @@ def update_burnout_risk_scores(current_df, historical_scores=None, smoothing_fac
         
         if burnout_level != "Low":
             # Get detailed overtime breakdown for display
-            author_df = current_df[current_df['Author'] == author]
-            if not author_df.empty:
-                overtime_data = calculate_overtime_hours(
-                    author_df, 0, 0, working_hours, working_days, holidays
-                )
-                total_hours = (author_df['Time Spent (seconds)'] / 3600).sum()
+            if author in per_author.index:
+                overtime_data = per_author.loc[author]
+                total_hours = hours_by_author[author]
                 overtime_percentage = (current_overtime_hours / total_hours * 100) if total_hours > 0 else 0
             else:
                 overtime_data = {'weekend_hours': 0, 'daily_overtime': 0, 'holiday_overtime': 0}
@@ -545,32 +1175,15 @@ def detect_burnout(df, working_hours=8, working_days=None, holidays=None, burnou
     if df.empty:
         return []
     
-    # For now, we'll use a simple historical scores simulation
-    # In a real application, this would be stored in a database
-    # and retrieved/updated with each analysis
-    
-    # Simulate some historical scores (in production, load from storage)
-    historical_scores = {}
-    for author in df['Author'].unique():
-        # Initialize with a baseline score based on current data patterns
-        author_df = df[df['Author'] == author]
-        if not author_df.empty:
-            current_overtime_data = calculate_overtime_hours(
-                author_df, 0, 0, working_hours, working_days, holidays
-            )
-            # Start with 70% of current overtime as historical baseline
-            historical_scores[author] = current_overtime_data['total_overtime'] * 0.7
-    
-    # Use EMA-based burnout detection
+    # Scores are loaded from and saved back to the burnout score store
     updated_scores, burnout_cases = update_burnout_risk_scores(
-        df, historical_scores, smoothing_factor=0.4, 
+        df, smoothing_factor=0.4,
         working_hours=working_hours, working_days=working_days, holidays=holidays
     )
     
-    # In production, save updated_scores back to storage here
-    
     return burnout_cases
 
+@timed
 def calculate_overtime_hours(df, leave_days=0, holiday_days=0, working_hours=8, working_days=None, holidays=None):
     """
     Calculate overtime hours based on custom working days and daily overtime work.
@@ -579,62 +1192,10 @@ def calculate_overtime_hours(df, leave_days=0, holiday_days=0, working_hours=8,
     if df.empty:
         return {'weekend_hours': 0, 'daily_overtime': 0, 'leave_overtime': 0, 'holiday_overtime': 0, 'total_overtime': 0}
     
-    if working_days is None:
-        working_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-    if holidays is None:
-        holidays = []
-
-    day_name_to_num = {
-        'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-        'Friday': 4, 'Saturday': 5, 'Sunday': 6
-    }
-    working_day_nums = [day_name_to_num[day] for day in working_days if day in day_name_to_num]
-
-    df['Start Date'] = pd.to_datetime(df['Start Date']).dt.tz_localize(None)
-    df['Hours spent'] = df['Time Spent (seconds)'] / 3600
-    df['Weekday'] = df['Start Date'].dt.weekday
-    df['DateStr'] = df['Start Date'].dt.strftime('%Y-%m-%d')
-
-    # Group by Author and Date for daily overtime calculation
-    daily_work = df.groupby(['Author', 'Start Date', 'Weekday', 'DateStr'])['Hours spent'].sum().reset_index()
-
-    # Calculate overtime components for each author
-    overtime_by_author = []
-    for author in df['Author'].unique():
-        author_data = daily_work[daily_work['Author'] == author]
-        weekend_hours = author_data[~author_data['Weekday'].isin(working_day_nums)]['Hours spent'].sum()
-        holiday_hours = author_data[author_data['DateStr'].isin(holidays)]['Hours spent'].sum()
-        working_day_records = author_data[
-            (author_data['Weekday'].isin(working_day_nums)) & 
-            (~author_data['DateStr'].isin(holidays))
-        ]
-        daily_overtime = working_day_records[working_day_records['Hours spent'] > working_hours]['Hours spent'].apply(lambda x: x - working_hours).sum()
-        leave_overtime = leave_days * working_hours
-        total_overtime = weekend_hours + holiday_hours + daily_overtime + leave_overtime
-
-        overtime_by_author.append({
-            'author': author,
-            'weekend_hours': round(weekend_hours, 2),
-            'holiday_overtime': round(holiday_hours, 2),
-            'daily_overtime': round(daily_overtime, 2),
-            'leave_overtime': round(leave_overtime, 2),
-            'total_overtime': round(total_overtime, 2)
-        })
-
-    # If only one author selected, return their overtime
-    if len(overtime_by_author) == 1:
-        return overtime_by_author[0]
-
-    # For 'All' authors, sum up the components
-    total_overtime = {
-        'weekend_hours': round(sum(a['weekend_hours'] for a in overtime_by_author), 2),
-        'holiday_overtime': round(sum(a['holiday_overtime'] for a in overtime_by_author), 2),
-        'daily_overtime': round(sum(a['daily_overtime'] for a in overtime_by_author), 2),
-        'leave_overtime': round(sum(a['leave_overtime'] for a in overtime_by_author), 2)
-    }
-    total_overtime['total_overtime'] = round(sum(total_overtime.values()), 2)
-    return total_overtime
+    overtime = compute_overtime(df, working_hours, working_days, holidays)
+    return summarize_overtime(overtime_by_author(overtime, leave_days, working_hours))
 
+@timed
 def process_summary(df, category_type="Activity", summary_type="Issue Summary", sort_by="Author", is_reverse_timesheet=False):
     """Generates a summary of time spent per task."""
     if df.empty:
@@ -642,7 +1203,7 @@ def process_summary(df, category_type="Activity", summary_type="Issue Summary",
     
     if is_reverse_timesheet:
         # For reverse timesheet, ALWAYS group by Issue Key regardless of sort option
-        summary_df = df.groupby(['Issue Key'], as_index=False).agg({
+        summary_df = df.groupby(['Issue Key'], observed=True, as_index=False).agg({
             'Time Spent (seconds)': 'sum',
             'Author': 'first',  # Take first author for the ticket
             'Issue Status': 'first',  # Take first status
@@ -652,7 +1213,7 @@ def process_summary(df, category_type="Activity", summary_type="Issue Summary",
         
         # Use Activity if available, otherwise use 'General'
         if 'Activity' in df.columns:
-            summary_df['Category'] = df.groupby(['Issue Key'])['Activity'].first().values
+            summary_df['Category'] = df.groupby(['Issue Key'], observed=True)['Activity'].first().values
         else:
             summary_df['Category'] = 'General'
         
@@ -681,9 +1242,8 @@ def process_summary(df, category_type="Activity", summary_type="Issue Summary",
     elif 'Activity' in df.columns:
         group_col = 'Activity'  # Fallback to Activity if available
     else:
-        # If neither column exists, create a default category
-        df['General'] = 'General'
-        group_col = 'General'
+        # If neither column exists, everything falls under a default category
+        group_col = None
     
     # ✅ Handle summary type selection (Issue Summary vs Parent Summary)
     if summary_type == "Parent Summary" and 'Parent Summary' in df.columns:
@@ -694,10 +1254,14 @@ def process_summary(df, category_type="Activity", summary_type="Issue Summary",
         summary_col = 'Issue Summary'  # Use as is even if column doesn't exist
     
     # Group by and include Issue Key for sorting purposes
+    group_cols = [summary_col, 'Author', 'Issue Status']
     summary_df = df.groupby(
-        [group_col, summary_col, 'Author', 'Issue Status'],
-        as_index=False
+        group_cols if group_col is None else [group_col] + group_cols,
+        observed=True, as_index=False
     )['Time Spent (seconds)'].sum()
+    if group_col is None:
+        group_col = 'General'
+        summary_df.insert(0, group_col, 'General')
     summary_df['Total Efforts (hrs)'] = round(summary_df['Time Spent (seconds)'] / 3600, 2)
     summary_df.rename(columns={group_col: 'Category', summary_col: 'Summary'}, inplace=True)
     
@@ -714,6 +1278,7 @@ def process_summary(df, category_type="Activity", summary_type="Issue Summary",
     
     return summary_df[['Category', 'Summary', 'Author', 'Issue Status', 'Total Efforts (hrs)']]
 
+@timed
 def process_reverse_timesheet(df):
     """
     Process uploaded timesheet template and convert it back to Jira-like format for dashboard visualization.
@@ -769,31 +1334,101 @@ def format_date(date_str):
         return datetime.strptime(date_str, "%Y-%m-%d").strftime("%d/%m/%Y")
     return ""
 
-def process_sprint_closure_report(df, summary_type="Issue Summary"):
+# Column header cell format matching pandas' to_excel headers
+EXCEL_HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+# Row highlight per value of the timesheet's Time column
+TIMESHEET_HIGHLIGHTS = {'Holiday': 'yellow', 'Leave': '#ffcc99'}  # light orange for leave days
+
+def write_sheet_row(worksheet, row, col, values, cell_format=None):
+    """Write values left to right from (row, col); missing values stay blank."""
+    for offset, value in enumerate(values):
+        if not pd.isna(value):
+            worksheet.write(row, col + offset, value, cell_format)
+
+def write_sheet_rows(worksheet, first_row, df):
     """
-    Generates the data for the Sprint Closure Report.
-    Fixed to properly calculate user-based efforts mapping.
+    Write a DataFrame's values from first_row down, a row at a time as constant-memory
+    mode requires, with one typed writer per column; missing values and '' stay blank.
     """
-    if df.empty:
-        return BytesIO()
-        
-    df['Start Date'] = pd.to_datetime(df['Start Date'])
-    df['Hours Spent'] = df['Time Spent (seconds)'] / 3600
+    columns = []
+    for col, name in enumerate(df.columns):
+        values = df[name]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            columns.append((col, worksheet.write_number, values.to_numpy(dtype=float).tolist(), values.notna().tolist()))
+        else:
+            values = values.astype(object)
+            write = worksheet.write_string if pd.api.types.infer_dtype(values, skipna=True) == 'string' else worksheet.write
+            columns.append((col, write, values.tolist(), (values.notna() & (values != '')).tolist()))
+
+    for offset in range(len(df)):
+        row = first_row + offset
+        for col, write, values, present in columns:
+            if present[offset]:
+                write(row, col, values[offset])
+
+@timed
+def write_timesheet_workbook(output_df, sheet_name):
+    """
+    Detailed timesheet (from process_timesheet) as xlsx bytes. Cells hold plain values;
+    Holiday and Leave rows are highlighted by conditional formats on the Time column.
+    """
+    import xlsxwriter
+    from xlsxwriter.utility import xl_col_to_name
+
+    output_io = BytesIO()
+    # Ticket links stay plain text, as in the rest of the report
+    workbook = xlsxwriter.Workbook(output_io, {'constant_memory': True, 'strings_to_urls': False})
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    write_sheet_row(worksheet, 0, 0, output_df.columns, workbook.add_format(EXCEL_HEADER_FORMAT))
+    write_sheet_rows(worksheet, 1, output_df)
+
+    if not output_df.empty:
+        time_col = xl_col_to_name(output_df.columns.get_loc('Time'))
+        for value, color in TIMESHEET_HIGHLIGHTS.items():
+            worksheet.conditional_format(1, 0, len(output_df), len(output_df.columns) - 1, {
+                'type': 'formula',
+                'criteria': f'=${time_col}2="{value}"',
+                'format': workbook.add_format({'bg_color': color}),
+            })
 
-    # Convert estimation fields to hours
-    df['Original Estimate'] = df['Original Estimate (seconds)'] / 3600
-    df['Remaining Estimate'] = df['Remaining Estimate (seconds)'] / 3600
+    workbook.close()
+    return output_io.getvalue()
+
+@timed
+def sprint_closure_tables(df, summary_type="Issue Summary"):
+    """
+    Generates the data for the Sprint Closure Report: available capacity, burned
+    capacity and the features table (estimated vs actual effort per user and task).
+    Each user's estimated effort is their share of the task's original estimate,
+    split by actual hours (or equally when no hours were logged), computed per task
+    group in one pass.
+    """
+    if df.empty:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+
+    df = normalized(df)
+    work = pd.DataFrame({
+        'Author': df['Author'],
+        'Labels': df['Labels'],
+        'Day': df['Work Date'],
+        'Weekday': df['Work Weekday'],
+        'Hours Spent': df['Work Hours'],
+        # Convert estimation fields to hours
+        'Original Estimate': df['Original Estimate (seconds)'] / 3600,
+        'Issue Status': df['Issue Status'],
+    })
 
     # 1. Available Capacity
-    weekdays_df = df[df['Start Date'].dt.weekday < 5].copy()
-    working_days = weekdays_df.groupby('Author')['Start Date'].apply(lambda s: s.dt.date.nunique()).reset_index()
+    weekdays = work[work['Weekday'].isin(range(5))]  # Monday to Friday
+    working_days = weekdays.groupby('Author', observed=True)['Day'].nunique().reset_index()
     working_days.columns = ['Team Member Name', 'Working Days']
     working_days['Available Capacity (Hours)'] = working_days['Working Days'] * 8
 
     # 2. Burned Capacity
     burned_capacity = pd.pivot_table(
-        df, values='Hours Spent', index='Author', columns='Labels',
-        aggfunc='sum', fill_value=0
+        work, values='Hours Spent', index='Author', columns='Labels',
+        aggfunc='sum', fill_value=0, observed=True
     ).round(2)
     if not burned_capacity.empty:
         burned_capacity['Grand Total'] = burned_capacity.sum(axis=1)
@@ -805,83 +1440,87 @@ def process_sprint_closure_report(df, summary_type="Issue Summary"):
         summary_col = 'Parent Summary'
     else:
         summary_col = 'Issue Summary'  # Default fallback
-    
-    # ✅ FIXED: Calculate user-based efforts mapping
-    # Group by Labels, Summary, and Author to get per-user task breakdown
-    user_task_summary = df.groupby(['Labels', summary_col, 'Author']).agg({
+    work[summary_col] = df[summary_col]
+
+    # Per-user breakdown of every (Labels, Summary) task
+    user_task_summary = work.groupby(['Labels', summary_col, 'Author'], observed=True).agg({
         'Original Estimate': 'first',  # Take the original estimate for the task
         'Hours Spent': 'sum',  # Sum actual hours spent by this user on this task
         'Issue Status': 'first'  # Take first status for grouped items
     }).reset_index()
-    
-    # Now calculate estimated and actual efforts based on user participation
-    features_list = []
-    
-    # Group by Labels and Summary to get all tasks
-    for (label, summary), task_group in user_task_summary.groupby(['Labels', summary_col]):
-        # Get all users who worked on this task
-        users_on_task = task_group['Author'].tolist()
-        total_users = len(users_on_task)
-        
-        # Get the original estimate for this task (should be same for all users)
-        original_estimate = task_group['Original Estimate'].iloc[0]
-        
-        # For each user who worked on this task
-        for _, user_row in task_group.iterrows():
-            user = user_row['Author']
-            actual_hours = user_row['Hours Spent']
-            status = user_row['Issue Status']
-            
-            # Calculate estimated effort for this user:
-            # If multiple users worked on the task, split the estimate proportionally
-            # based on their actual contribution
-            total_actual_hours = task_group['Hours Spent'].sum()
-            if total_actual_hours > 0:
-                # Proportional allocation based on actual work done
-                user_estimated_effort = original_estimate * (actual_hours / total_actual_hours)
-            else:
-                # If no actual work logged, split estimate equally among users
-                user_estimated_effort = original_estimate / total_users if total_users > 0 else original_estimate
-            
-            features_list.append({
-                'Type of Work': label,
-                'Particular': summary,
-                'Resource Name': user,
-                'Extimated efforts': round(user_estimated_effort, 2),
-                'Actual Effrots': round(actual_hours, 2),
-                'Remark': status
-            })
-    
-    # Convert to DataFrame
-    features_df = pd.DataFrame(features_list)
-    
+
+    # Split each task's estimate across its users in proportion to their actual
+    # hours, or equally when no actual work was logged on the task
+    task_groups = user_task_summary.groupby(['Labels', summary_col], observed=True)
+    task_estimate = task_groups['Original Estimate'].transform('first', skipna=False)
+    task_hours = task_groups['Hours Spent'].transform('sum')
+    task_users = task_groups['Author'].transform('size')
+    actual_hours = user_task_summary['Hours Spent']
+    user_estimated_effort = np.where(
+        task_hours > 0,
+        task_estimate * (actual_hours / task_hours.where(task_hours > 0)),
+        task_estimate / task_users
+    )
+
+    features_df = pd.DataFrame({
+        'Type of Work': user_task_summary['Labels'].astype(object),
+        'Particular': user_task_summary[summary_col].astype(object),
+        'Resource Name': user_task_summary['Author'].astype(object),
+        'Extimated efforts': pd.Series(user_estimated_effort).round(2),
+        'Actual Effrots': actual_hours.round(2),
+        'Remark': user_task_summary['Issue Status'].astype(object)
+    })
+
     # Sort by Resource Name (Author) and then by Type of Work
     if not features_df.empty:
         features_df.sort_values(by=['Resource Name', 'Type of Work'], inplace=True)
         features_df.reset_index(drop=True, inplace=True)
         features_df.insert(0, 'Sr Number', features_df.index + 1)
 
+    return working_days, burned_capacity, features_df
+
+@timed
+def process_sprint_closure_report(df, summary_type="Issue Summary"):
+    """
+    Builds the Sprint Closure Report workbook, written row by row in constant-memory mode.
+    """
+    import xlsxwriter
+
+    if df.empty:
+        return BytesIO()
+
+    working_days, burned_capacity, features_df = sprint_closure_tables(df, summary_type)
 
-    # Write to an in-memory Excel file
+    # Write to an in-memory Excel file. Constant-memory mode flushes each row as soon as
+    # the next one starts, so rows are written top to bottom and the capacity tables
+    # (side by side from row 4) are written together, one row at a time.
     output_io = BytesIO()
-    with pd.ExcelWriter(output_io, engine='xlsxwriter') as writer:
-        workbook = writer.book
-        worksheet = workbook.add_worksheet('Sprint Closure Report')
-        header_format = workbook.add_format({'bold': True, 'font_size': 14, 'align': 'center', 'valign': 'vcenter'})
-        table_header_format = workbook.add_format({'bold': True, 'bg_color': '#DDEBF7', 'border': 1, 'text_wrap': True})
-        worksheet.merge_range('A1:L1', 'Sprint Closure Report', header_format)
-        
-        if not working_days.empty:
-            working_days.to_excel(writer, sheet_name='Sprint Closure Report', startrow=3, index=False)
-        if not burned_capacity.empty:
-            burned_capacity.to_excel(writer, sheet_name='Sprint Closure Report', startrow=3, startcol=4, index=False)
-        if not features_df.empty:
-            next_row = max(len(working_days), len(burned_capacity)) + 6
-            features_df.to_excel(writer, sheet_name='Sprint Closure Report', startrow=next_row, index=False)
+    workbook = xlsxwriter.Workbook(output_io, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Sprint Closure Report')
+    header_format = workbook.add_format({'bold': True, 'font_size': 14, 'align': 'center', 'valign': 'vcenter'})
+    column_header_format = workbook.add_format(EXCEL_HEADER_FORMAT)
+    worksheet.merge_range('A1:L1', 'Sprint Closure Report', header_format)
+
+    side_by_side = [(table, col) for table, col in ((working_days, 0), (burned_capacity, 4)) if not table.empty]
+    for table, col in side_by_side:
+        write_sheet_row(worksheet, 3, col, table.columns, column_header_format)
+    table_rows = [(list(table.itertuples(index=False, name=None)), col) for table, col in side_by_side]
+    for offset in range(max((len(rows) for rows, _ in table_rows), default=0)):
+        for rows, col in table_rows:
+            if offset < len(rows):
+                write_sheet_row(worksheet, 4 + offset, col, rows[offset])
+
+    if not features_df.empty:
+        next_row = max(len(working_days), len(burned_capacity)) + 6
+        write_sheet_row(worksheet, next_row, 0, features_df.columns, column_header_format)
+        write_sheet_rows(worksheet, next_row + 1, features_df)
+
+    workbook.close()
     output_io.seek(0)
     return output_io
 
 
+@timed
 def availableCapacity(df, selectedAuthor=None, workingHours=8, workingDays=None, holidays=None, customColumn=None):
     """
     Calculate available capacity and category-wise hours per team member.
@@ -892,23 +1531,22 @@ def availableCapacity(df, selectedAuthor=None, workingHours=8, workingDays=None,
     if df.empty:
         return [], []
 
-    # Ensure Start Date is datetime
-    df['Start Date'] = pd.to_datetime(df['Start Date'])
-    df['Hours Spent'] = df['Time Spent (seconds)'] / 3600
+    columnNameFilter =customColumn if customColumn in df.columns else 'Labels'
+    print("customColumn:", customColumn)
+    print(columnNameFilter)
+
+    # Work on the daily cube (hours per Author, day and category)
+    cube = df if is_daily_cube(df) else build_daily_cube(df, [columnNameFilter])
 
     # --- Capacity Calculation ---
-    weekdays_df = df[df['Start Date'].dt.weekday < 5].copy()
+    weekdays_cube = cube[cube['Weekday'].isin(range(5))]  # Monday to Friday
 
-    working_days = (
-        weekdays_df.groupby('Author')['Start Date']
-        .apply(lambda s: s.dt.date.nunique())
-        .reset_index()
-    )
+    working_days = weekdays_cube.groupby('Author', observed=True)['Date'].nunique().reset_index()
     working_days.columns = ['Team Member Name', 'Working Days']
     working_days['Available Capacity (Hours)'] = working_days['Working Days'] * workingHours
 
-    if 'LeaveDays' in df.columns:
-        leave_info = df.groupby('Author')['LeaveDays'].max().reset_index()
+    if 'LeaveDays' in cube.columns:
+        leave_info = cube.groupby('Author', observed=True)['LeaveDays'].max().reset_index()
         leave_info.columns = ['Team Member Name', 'Leave Days']
         working_days = working_days.merge(leave_info, on='Team Member Name', how='left')
         working_days['Leave Days'] = working_days['Leave Days'].fillna(0).astype(int)
@@ -917,13 +1555,10 @@ def availableCapacity(df, selectedAuthor=None, workingHours=8, workingDays=None,
 
     capacity_list = working_days.to_dict(orient='records')
 
-    columnNameFilter =customColumn if customColumn in df.columns else 'Labels'
-    print("customColumn:", customColumn)
-    print(columnNameFilter)
     # --- Category-wise Hours (Burned Capacity) ---
     burned_capacity = pd.pivot_table(
-        df, values='Hours Spent', index='Author', columns=columnNameFilter,
-        aggfunc='sum', fill_value=0
+        cube, values='Hours', index='Author', columns=columnNameFilter,
+        aggfunc='sum', fill_value=0, observed=True
     ).round(2)
 
     if not burned_capacity.empty:
@@ -935,41 +1570,25 @@ def availableCapacity(df, selectedAuthor=None, workingHours=8, workingDays=None,
 
     return capacity_list, category_hours_list
 
+@timed
 def getStoryAndTaskCount(df):
     """
     Returns the count of unique stories and tasks in the global dataframe.
     """
-   
-   # --- Calculate unique counts ---
-    task_count = 0
     story_count = 0
-    unique_story_ids = []
-    unique_task_ids = []
+    task_count = 0
 
     if not df.empty:
-                    # --- Handle task keys ---
-        task_keys = []
-        if 'Issue Key' in df.columns:
-            task_keys = df['Issue Key'].dropna().tolist()
-        for key in task_keys:
-            if key not in unique_task_ids:
-                unique_task_ids.append(key)
-
-        # --- Handle parent keys ---
-        parent_keys = []
+        # Distinct keys are read straight from the (categorical) key columns
         if 'Parent Key' in df.columns:
-            parent_keys = df['Parent Key'].dropna().tolist()
-        for key in parent_keys:
-            if key not in unique_story_ids:
-                unique_story_ids.append(key)
-
-        story_count = len(unique_story_ids)
-        task_count = len(unique_task_ids)
-
+            story_count = int(df['Parent Key'].nunique())
+        if 'Issue Key' in df.columns:
+            task_count = int(df['Issue Key'].nunique())
 
     return story_count, task_count
 
 
+@timed
 def getAuthorSubtaskCount(df):
     """
     Returns a list of (Author, Subtask Count) for each author.
@@ -989,7 +1608,7 @@ def getAuthorSubtaskCount(df):
         print(f"Debug - getAuthorSubtaskCount: Subtask DataFrame shape: {subtask_df.shape}")
 
         # Group by author and count unique subtasks Worklog Id
-        for author, group in subtask_df.groupby('Author'):
+        for author, group in subtask_df.groupby('Author', observed=True):
             unique_tasks = group['Issue Key'].dropna().unique()
             author_task_list.append({
                 "Author": author,
@@ -1041,31 +1660,35 @@ def session_check():
     except DataNotFoundError:
         return jsonify({"status": "invalid"}), 404
 
+@app.route('/metrics')
+def metrics():
+    """Stage and request timings, dataset sizes and cache hit rates for Prometheus"""
+    from utils import render_metrics
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/process', methods=['POST'])
 def process_file_route():
     """
-    Handles the file upload, cleans author names, stores data in temporary storage,
-    and redirects to the report view.
+    Handles the upload of one or more Jira exports (several are parsed in parallel and
+    merged), cleans author names, stores data in temporary storage, and redirects to
+    the report view.
     """
     if 'file' not in request.files or not request.form.get('base_url'):
         return "Missing file or base URL", 400
 
-    file = request.files['file']
-    if file.filename == '':
+    files = [file for file in request.files.getlist('file') if file.filename]
+    if not files:
         return "No selected file", 400
 
-    original_filename = file.filename
     try:
-        if original_filename.lower().endswith('.csv'):
-            df = pd.read_csv(file)
+        if len(files) == 1:
+            original_filename = files[0].filename
+            df = parse_worklog_file(files[0], original_filename)
         else:
-            df = pd.read_excel(file)
-    except Exception as e:
-        return f"Error reading file: {e}", 400
-    
-    # Clean whitespace from author names to ensure accurate filtering.
-    if 'Author' in df.columns:
-        df['Author'] = df['Author'].str.strip()
+            original_filename = "merged_timesheet.xlsx"
+            df = read_worklog_uploads(files)
+    except InvalidUploadError as e:
+        return str(e), 400
 
     # Debug: Check for duplicate authors
     print(f"Debug - Raw authors from CSV: {df['Author'].unique().tolist()}")
@@ -1074,8 +1697,10 @@ def process_file_route():
     print(f"Debug - Author count: {len(unique_authors)}")
 
     # Store DataFrame in temporary file
-    from utils import save_dataframe
+    from utils import save_dataframe, save_aggregate
     file_id = save_dataframe(df)
+    save_aggregate(file_id, 'cube', build_daily_cube(df))
+    save_aggregate(file_id, 'keys', worklog_key_table(df))  # checked by /process_append
     
     # Store only metadata in session
     session['file_id'] = file_id
@@ -1086,6 +1711,41 @@ def process_file_route():
     # Redirect to the report page
     return redirect(url_for('results'))
 
+@app.route('/process_append', methods=['POST'])
+def process_append_route():
+    """
+    Appends a delta Jira export (e.g. last week's worklogs) to the session dataset,
+    skipping worklogs that are already stored, and redirects to the report view.
+    """
+    try:
+        data = get_session_data()
+    except DataNotFoundError:
+        return redirect(url_for('index'))
+
+    if data['base_url'] == "https://imported-timesheet/":
+        return "Appending is only supported for Jira exports", 400
+
+    if 'file' not in request.files or request.files['file'].filename == '':
+        return "No selected file", 400
+
+    file = request.files['file']
+    try:
+        delta = parse_worklog_file(file, file.filename)
+    except InvalidUploadError as e:
+        return str(e), 400
+
+    # Datasets merged from several exports record the file each worklog came from
+    if SOURCE_FILE_COLUMN in data['df'].columns:
+        delta[SOURCE_FILE_COLUMN] = pd.Categorical([file.filename] * len(delta))
+
+    new_rows = append_worklogs(data, delta)
+    print(f"Debug - Appended {len(new_rows)} of {len(delta)} worklogs from {file.filename}")
+
+    if not new_rows.empty:
+        session['user_authors'] = sorted(set(data['authors']) | set(new_rows['Author'].dropna().unique().tolist()))
+
+    return redirect(url_for('results'))
+
 @app.route('/process_reverse', methods=['POST'])
 def process_reverse_timesheet_route():
     """
@@ -1132,6 +1792,12 @@ def process_reverse_timesheet_route():
         # Handle any remaining NaN values
         df['Author'] = df['Author'].fillna('Unknown')
 
+    # Compact typed schema: categoricals for repetitive text, integer seconds
+    try:
+        df = normalize_worklogs(compact_worklogs(df))
+    except InvalidUploadError as e:
+        return str(e), 400
+
     # Get unique authors list - ensure 'Unknown' is included if present
     unique_authors = sorted(df['Author'].unique().tolist()) if 'Author' in df.columns else ['Unknown']
     
@@ -1140,8 +1806,9 @@ def process_reverse_timesheet_route():
         unique_authors = ['Unknown']
 
     # Store DataFrame in temporary file (same as regular Jira upload)
-    from utils import save_dataframe
+    from utils import save_dataframe, save_aggregate
     file_id = save_dataframe(df)
+    save_aggregate(file_id, 'cube', build_daily_cube(df))
     
     # Store only metadata in session (same pattern as process_file_route)
     session['file_id'] = file_id
@@ -1190,6 +1857,10 @@ def upload_holidays():
         current_holidays = set(session.get('holidays', []))
         current_holidays.update(valid_dates.dt.strftime('%Y-%m-%d').tolist())
         session['holidays'] = list(current_holidays)
+
+        # Reports computed with the previous holidays are stale now
+        from utils import invalidate_results
+        invalidate_results(session.get('file_id'))
         
         return jsonify({
             'success': True, 
@@ -1204,6 +1875,7 @@ def get_holidays():
     """Returns the current list of holidays from the session."""
     return jsonify({'holidays': session.get('holidays', [])})
 
+@timed
 def calculate_overtime_list(df, leave_days=0, working_hours=8, working_days=None, holidays=None):
     """Return list of authors with non-zero overtime."""
     if df.empty:
@@ -1214,38 +1886,14 @@ def calculate_overtime_list(df, leave_days=0, working_hours=8, working_days=None
     if holidays is None:
         holidays = []
 
-    # Reuse same logic from calculate_overtime_hours
-    overtime = calculate_overtime_hours(df, leave_days, 0, working_hours, working_days, holidays)
-
-    # If calculate_overtime_hours returned aggregate (dict, not list), rebuild per author
-    df['Start Date'] = pd.to_datetime(df['Start Date']).dt.tz_localize(None)
-    df['Hours spent'] = df['Time Spent (seconds)'] / 3600
-    df['Weekday'] = df['Start Date'].dt.weekday
-    df['DateStr'] = df['Start Date'].dt.strftime('%Y-%m-%d')
-
-    day_name_to_num = {
-        'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-        'Friday': 4, 'Saturday': 5, 'Sunday': 6
-    }
-    working_day_nums = [day_name_to_num[day] for day in working_days]
-
-    daily_work = df.groupby(['Author', 'Start Date', 'Weekday', 'DateStr'])['Hours spent'].sum().reset_index()
-    overtime_list = []
-
-    for author in df['Author'].unique():
-        author_data = daily_work[daily_work['Author'] == author]
-        weekend_hours = author_data[~author_data['Weekday'].isin(working_day_nums)]['Hours spent'].sum()
-        holiday_hours = author_data[author_data['DateStr'].isin(holidays)]['Hours spent'].sum()
-        working_day_records = author_data[(author_data['Weekday'].isin(working_day_nums)) & (~author_data['DateStr'].isin(holidays))]
-        daily_overtime = working_day_records[working_day_records['Hours spent'] > working_hours]['Hours spent'].apply(lambda x: x - working_hours).sum()
-        leave_overtime = leave_days * working_hours
-        total_overtime = weekend_hours + holiday_hours + daily_overtime + leave_overtime
-
-        if total_overtime > 0:  # Only include authors with overtime
-            overtime_list.append({
-                "Author": author,
-                "Total Overtime (hrs)": round(total_overtime, 2)
-            })
+    per_author = overtime_by_author(
+        compute_overtime(df, working_hours, working_days, holidays), leave_days, working_hours
+    )
+    per_author = per_author[per_author['total_overtime'] > 0]  # Only include authors with overtime
+    overtime_list = [
+        {"Author": author, "Total Overtime (hrs)": float(total)}
+        for author, total in per_author['total_overtime'].items()
+    ]
 
     return overtime_list
           
@@ -1259,6 +1907,10 @@ def set_holidays():
         data = request.get_json()
         holidays = data.get('holidays', [])
         session['holidays'] = list(set(holidays))
+
+        # Reports computed with the previous holidays are stale now
+        from utils import invalidate_results
+        invalidate_results(session.get('file_id'))
         return jsonify({'success': True, 'holidays': session['holidays']})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -1282,7 +1934,7 @@ def reportToolbar():
         from werkzeug.utils import secure_filename
         import os
         import uuid
-        from utils import get_temp_dir
+        from utils import get_temp_dir, register_session_file
 
         # Get file extension and session ID
         _, ext = os.path.splitext(logo_file.filename)
@@ -1298,6 +1950,7 @@ def reportToolbar():
         temp_dir = get_temp_dir()
         logo_path = os.path.join(temp_dir, temp_filename)
         logo_file.save(logo_path)
+        register_session_file(file_id, logo_path)
         session['logo_filename'] = temp_filename  # Store temp filename in session
 
     # Date range
@@ -1317,6 +1970,209 @@ def reportToolbar():
   
                 
 
+# Dashboard panels, each served on its own by /api/panels/<panel>
+DASHBOARD_PANELS = ['counts', 'capacity', 'category_totals', 'summary', 'overtime',
+                    'weekly_overtime', 'overtime_list', 'author_tasks']
+# Render /report as a shell and let the page fetch its panels (set to 0 to render inline)
+LAZY_PANELS = os.environ.get('LAZY_PANELS', '1') != '0'
+
+def dashboard_selection(args):
+    """Parse the dashboard filters shared by /report and the panel endpoints."""
+    selected_category = args.get('category_type', 'Activity')
+    custom_column = args.get('custom_column', '')
+
+    # Handle custom column selection
+    if selected_category not in ['Activity', 'Label']:
+        custom_column = selected_category
+    elif selected_category == 'Custom' and custom_column:
+        selected_category = custom_column
+
+    # Get selected authors
+    selected_authors = args.getlist('author')
+    
+    # Debug: Log selected authors from request
+    print(f"Debug - Selected authors from request: {selected_authors}")
+    
+    # Clean up selected authors list to remove any duplicates and handle 'All' properly
+    if selected_authors:
+        if 'All' in selected_authors:
+            # If All is selected along with other authors, ignore other authors
+            selected_authors = ['All']
+        else:
+            # Remove duplicates while preserving order
+            selected_authors = list(dict.fromkeys(selected_authors))
+            if not selected_authors:
+                # If list becomes empty after removing duplicates, default to All
+                selected_authors = ['All']
+    else:
+        # Default to 'All' if no authors selected
+        selected_authors = ['All']
+        
+    print(f"Debug - Selected authors after processing: {selected_authors}")
+
+    return {
+        'selected_authors': selected_authors,
+        'selected_category': selected_category,
+        'selected_summary_type': args.get('summary_type', 'Issue Summary'),
+        'summary_sort_by': args.get('summary_sort_by', 'Author'),
+        'working_hours': float(args.get('working_hours', 8)),
+        'working_days': args.getlist('working_days') or ['Monday','Tuesday','Wednesday','Thursday','Friday'],
+        'leave_days': float(args.get('leave_days', 0)),
+        'holiday_days': float(args.get('holiday_days', 0)),
+    }
+
+def dashboard_panels(data, selection):
+    """
+    Builders for the dashboard panels, keyed by panel name. Each returns the
+    template variables of its panel and is memoized per dataset and the
+    parameters it depends on, so panels can be computed independently.
+    """
+    from utils import cached_result, increment
+
+    df = data['df']
+    holidays = data.get('holidays', [])
+    file_id = data['file_id']
+    selected_authors = selection['selected_authors']
+    selected_category = selection['selected_category']
+    working_hours = selection['working_hours']
+    working_days = selection['working_days']
+    leave_days = selection['leave_days']
+    is_reverse_timesheet = data['base_url'] == "https://imported-timesheet/"
+
+    # Filter dataframe based on selected authors (the panels only read it)
+    if selected_authors != ['All']:
+        display_df = df[df['Author'].isin(selected_authors)]
+    else:
+        display_df = df
+
+    # Hour-based panels read the daily cube (authors x days) instead of the raw
+    # worklogs; a custom category column that isn't in the cube uses the raw rows.
+    cube = data['cube']
+    if selected_authors != ['All']:
+        display_cube = cube[cube['Author'].isin(selected_authors)]
+    else:
+        display_cube = cube
+    capacity_column = selected_category if selected_category in df.columns else 'Labels'
+    capacity_source = display_cube if capacity_column in cube.columns else display_df
+    category_column = resolve_category_column(df.columns, selected_category)
+    totals_source = display_cube if category_column is None or category_column in cube.columns else display_df
+
+    panel_params = {'authors': selected_authors}
+    overtime_params = dict(panel_params, leave_days=leave_days, working_hours=working_hours,
+                           working_days=working_days, holidays=holidays)
+
+    # Panels over the raw worklogs are skipped (unless cached) when computing them
+    # could pass the memory ceiling; the cube-based panels are still shown.
+    def within_memory(compute):
+        def compute_within_limit():
+            check_memory(data, display_df)
+            return compute()
+        return compute_within_limit
+
+    def memory_limited(panel, empty):
+        increment('timesheet_memory_limited_total', endpoint=request.endpoint or 'unknown', action='degraded')
+        print(f"Memory - skipped the {panel} panel, not enough memory for {len(display_df)} worklogs")
+        return dict(empty, memory_limited=True)
+
+    def counts():
+        try:
+            unique_story_count, unique_task_count = cached_result(
+                file_id, 'story_task_count', panel_params,
+                within_memory(lambda: getStoryAndTaskCount(display_df))
+            )
+        except MemoryLimitError:
+            return memory_limited('counts', {'unique_story_count': '-', 'unique_task_count': '-'})
+        return {'unique_story_count': unique_story_count, 'unique_task_count': unique_task_count}
+
+    def capacity():
+        # Capacity and category hours for all selected authors at once
+        compute = lambda: availableCapacity(
+            capacity_source, None, working_hours, working_days, holidays, selected_category
+        )
+        try:
+            capacity_list, category_hours_list = cached_result(
+                file_id, 'capacity',
+                dict(panel_params, working_hours=working_hours, category=selected_category),
+                within_memory(compute) if capacity_source is display_df else compute
+            )
+        except MemoryLimitError:
+            return memory_limited('capacity', {'capacity_list': [], 'category_hours_list': []})
+        return {'capacity_list': capacity_list, 'category_hours_list': category_hours_list}
+
+    def category_totals():
+        compute = lambda: calculate_category_totals(totals_source, selected_category).to_dict(orient='records')
+        try:
+            totals = cached_result(
+                file_id, 'category_totals', dict(panel_params, category=selected_category),
+                within_memory(compute) if totals_source is display_df else compute
+            )
+        except MemoryLimitError:
+            return memory_limited('category_totals', {'category_totals': [], 'category_total_sum': 0})
+        return {'category_totals': totals,
+                'category_total_sum': sum(item['Hours spent'] for item in totals)}
+
+    def summary():
+        summary_sort_by = selection['summary_sort_by']
+        summary_type = selection['selected_summary_type']
+        try:
+            return {'summary_data': cached_result(
+                file_id, 'summary',
+                dict(panel_params, category=selected_category, summary_type=summary_type,
+                     sort_by=summary_sort_by, is_reverse_timesheet=is_reverse_timesheet),
+                within_memory(lambda: process_summary(
+                    display_df, selected_category, summary_type, summary_sort_by, is_reverse_timesheet
+                ).to_dict(orient='records'))
+            )}
+        except MemoryLimitError:
+            return memory_limited('summary', {'summary_data': []})
+
+    def overtime():
+        return {'overtime_data': cached_result(
+            file_id, 'overtime', overtime_params,
+            lambda: calculate_overtime_hours(
+                display_cube, leave_days, 0, working_hours, working_days, holidays
+            )
+        )}
+
+    def weekly_overtime():
+        return {'weekly_overtime_data': cached_result(
+            file_id, 'weekly_overtime', overtime_params,
+            lambda: calculate_weekly_overtime(
+                display_cube, working_hours, working_days, holidays
+            )
+        )}
+
+    def overtime_list():
+        # Per-author overtime table is only shown when "All" is selected
+        if 'All' not in selected_authors:
+            return {'overtime_list': []}
+        return {'overtime_list': cached_result(
+            file_id, 'overtime_list', overtime_params,
+            lambda: calculate_overtime_list(
+                display_cube, leave_days, working_hours, working_days, holidays
+            )
+        )}
+
+    def author_tasks():
+        try:
+            return {'author_task_data': cached_result(
+                file_id, 'author_subtask_count', panel_params,
+                within_memory(lambda: getAuthorSubtaskCount(display_df))
+            )}
+        except MemoryLimitError:
+            return memory_limited('author_tasks', {'author_task_data': []})
+
+    return {
+        'counts': counts,
+        'capacity': capacity,
+        'category_totals': category_totals,
+        'summary': summary,
+        'overtime': overtime,
+        'weekly_overtime': weekly_overtime,
+        'overtime_list': overtime_list,
+        'author_tasks': author_tasks,
+    }
+
 @app.route('/report', methods=['GET'])
 def results():
     try:
@@ -1327,15 +2183,9 @@ def results():
         holidays = data.get('holidays', [])
         authors = data['authors']
 
-        # Defaults
-        selected_category = request.args.get('category_type', 'Activity')
-        selected_summary_type = request.args.get('summary_type', 'Issue Summary')
-        summary_sort_by = request.args.get('summary_sort_by', 'Author')  # New sort parameter
-        working_hours = float(request.args.get('working_hours', 8))
-        working_days = request.args.getlist('working_days') or ['Monday','Tuesday','Wednesday','Thursday','Friday']
-        leave_days = float(request.args.get('leave_days', 0))
-        holiday_days = float(request.args.get('holiday_days', 0))
-        custom_column = request.args.get('custom_column', '')
+        selection = dashboard_selection(request.args)
+        check_category_column(df, selection['selected_category'])
+        selected_authors = selection['selected_authors']
 
         # Get project name and logo from session
         project_name = session.get('project_name')
@@ -1348,79 +2198,30 @@ def results():
         if not project_name and 'Project Name' in df.columns and not df['Project Name'].empty:
             project_name = df['Project Name'].iloc[0]
 
-        # Handle custom column selection
-        if selected_category not in ['Activity', 'Label']:
-            custom_column = selected_category
-        elif selected_category == 'Custom' and custom_column:
-            selected_category = custom_column
-
-        # Get selected authors and store in session
-        selected_authors = request.args.getlist('author')
-        
-        # Debug: Log selected authors from request
-        print(f"Debug - Selected authors from request: {selected_authors}")
-        
-        # Clean up selected authors list to remove any duplicates and handle 'All' properly
-        if selected_authors:
-            if 'All' in selected_authors:
-                # If All is selected along with other authors, ignore other authors
-                selected_authors = ['All']
-            else:
-                # Remove duplicates while preserving order
-                selected_authors = list(dict.fromkeys(selected_authors))
-                if not selected_authors:
-                    # If list becomes empty after removing duplicates, default to All
-                    selected_authors = ['All']
-        else:
-            # Default to 'All' if no authors selected
-            selected_authors = ['All']
-            
-        print(f"Debug - Selected authors after processing: {selected_authors}")
+        # Store selections in session
         session['selected_authors'] = selected_authors
-
-        # Store category and summary selections in session
-        session['selected_category'] = selected_category
-        session['selected_summary_type'] = selected_summary_type
-        
-
-        # Check if this is imported timesheet data
-        is_reverse_timesheet = base_url == "https://imported-timesheet/"
-        
-        # Filter dataframe based on selected authors
-        if selected_authors != ['All']:
-            display_df = df[df['Author'].isin(selected_authors)].copy()
-        else:
-            display_df = df.copy()
+        session['selected_category'] = selection['selected_category']
+        session['selected_summary_type'] = selection['selected_summary_type']
 
         # Store the list of displayed authors for UI
-        displayed_authors = sorted(display_df['Author'].unique().tolist())
-        session['displayed_authors'] = displayed_authors
-
-        # Calculate capacity and category hours once for all selected authors
-        capacity_list, category_hours_list = availableCapacity(
-            display_df.copy(), None, working_hours, working_days, holidays, selected_category
-        )
-        _, category_totals_df = process_timesheet(
-            display_df.copy(), base_url, selected_category, working_days, holidays
-        )
-        summary_df_for_ui = process_summary(display_df.copy(), selected_category, selected_summary_type, summary_sort_by,is_reverse_timesheet)
-        overtime_data = calculate_overtime_hours(
-            display_df.copy(), leave_days, 0, working_hours, working_days, holidays
-        )
-        weekly_overtime_data = calculate_weekly_overtime(
-            display_df.copy(), working_hours, working_days, holidays
+        displayed_authors = sorted(
+            author for author in authors if selected_authors == ['All'] or author in selected_authors
         )
+        session['displayed_authors'] = displayed_authors
 
-        # Build per-author overtime table if "All" selected
-        overtime_list = []
-        if selected_authors == ['All'] or 'All' in selected_authors:
-            overtime_list = calculate_overtime_list(
-                display_df.copy(), leave_days, working_hours, working_days, holidays
-            )
+        # Check if this is imported timesheet data
+        is_reverse_timesheet = base_url == "https://imported-timesheet/"
 
-        category_total_sum = category_totals_df['Hours spent'].sum() if not category_totals_df.empty else 0
-        unique_story_count, unique_task_count = getStoryAndTaskCount(display_df.copy())
-        author_task_list = getAuthorSubtaskCount(display_df.copy())
+        # The shell renders without panel data; the page fetches each panel from
+        # /api/panels/<panel>. Otherwise every panel is computed before rendering.
+        panels = {}
+        memory_limited_panels = []
+        if not LAZY_PANELS:
+            for name, build_panel in dashboard_panels(data, selection).items():
+                panel_data = build_panel()
+                if panel_data.pop('memory_limited', False):
+                    memory_limited_panels.append(name)
+                panels.update(panel_data)
 
         start_date_str = format_date(start_date)
         end_date_str = format_date(end_date)
@@ -1436,37 +2237,45 @@ def results():
         return render_template(
             'index.html',
             processed=True,
+            lazy_panels=LAZY_PANELS,
+            memory_limited_panels=memory_limited_panels,
             authors=authors,
-            selected_authors=selected_authors,
-            selected_category=selected_category,
-            selected_summary_type=selected_summary_type,
-            summary_sort_by=summary_sort_by,  # Add sort parameter to template
             is_reverse_timesheet=is_reverse_timesheet,  # Add flag for template
-            leave_days=leave_days,
-            holiday_days=holiday_days,
-            working_hours=working_hours,
-            working_days=working_days,
-            category_totals=category_totals_df.to_dict(orient='records'),
-            category_total_sum=category_total_sum,
-            summary_data=summary_df_for_ui.to_dict(orient='records'),
-            overtime_data=overtime_data,
-            weekly_overtime_data=weekly_overtime_data,
             holidays=holidays,
-            unique_task_count=unique_task_count,
-            unique_story_count=unique_story_count,
-            capacity_list=capacity_list,
-            category_hours_list=category_hours_list,
             project_name=project_name,
             logo_filename=logo_filename,
             start_date=start_date_str,
             end_date=end_date_str,
             key_insights=key_insights,
-            overtime_list=overtime_list,
-            author_task_data=author_task_list
+            **selection,
+            **panels
         )
     except DataNotFoundError:
         return redirect(url_for('index'))
 
+@app.route('/api/panels/<panel>')
+def dashboard_panel(panel):
+    """
+    One dashboard panel as JSON: its data and its rendered HTML fragment.
+    Takes the same query parameters as /report.
+    """
+    if panel not in DASHBOARD_PANELS:
+        return jsonify({'error': 'Unknown panel'}), 404
+    try:
+        data = get_session_data()
+    except DataNotFoundError:
+        return jsonify({'error': 'No data in session'}), 404
+
+    selection = dashboard_selection(request.args)
+    check_category_column(data['df'], selection['selected_category'])
+    is_reverse_timesheet = data['base_url'] == "https://imported-timesheet/"
+    panel_data = dashboard_panels(data, selection)[panel]()
+    html = render_template(f'panels/{panel}.html', is_reverse_timesheet=is_reverse_timesheet,
+                           **selection, **panel_data)
+    if panel_data.get('memory_limited'):
+        html = render_template('panels/memory_notice.html') + html
+    return jsonify({'panel': panel, 'data': panel_data, 'html': html})
+
 
    
     #    # NEW: build per-author overtime table if "All" selected
@@ -1514,6 +2323,140 @@ def results():
 
     # )
 
+# Download formats for /download/<report_type>?format=...
+EXPORT_MIMETYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+# Rows serialized per chunk of a streamed CSV/NDJSON download
+EXPORT_CHUNK_ROWS = 10000
+
+def table_chunks(build_table):
+    """Yield a table built in one piece (an aggregated report) EXPORT_CHUNK_ROWS rows at a time."""
+    table = build_table()
+    for start in range(0, max(len(table), 1), EXPORT_CHUNK_ROWS):
+        yield table.iloc[start:start + EXPORT_CHUNK_ROWS]
+
+def stream_table(chunks, export_format):
+    """Yield table chunks (DataFrames) as CSV (with header) or NDJSON text as they are produced."""
+    for i, chunk in enumerate(chunks):
+        if export_format == 'csv':
+            yield chunk.to_csv(index=False, header=i == 0)
+        elif len(chunk):
+            yield chunk.to_json(orient='records', lines=True, date_format='iso')
+
+def build_timesheet_workbook(df, base_url, category_type, working_days, holidays):
+    """Detailed timesheet workbook (xlsx bytes) for one author; runs in the export pool."""
+    output_df, _ = process_timesheet(df, base_url, category_type, working_days, holidays)
+    return write_timesheet_workbook(output_df, 'Timesheet')
+
+def bulk_timesheet_filename(author):
+    """ZIP entry name for an author's timesheet, without characters unsafe in filenames."""
+    clean_author_name = str(author).replace('/', '_').replace('\\', '_')
+    for char in '[]*?:<>|':
+        clean_author_name = clean_author_name.replace(char, '')
+    return f"{clean_author_name}_timesheet.xlsx"
+
+class ZipChunkWriter:
+    """Write-only file object collecting what zipfile writes, drained as response chunks."""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream_zip(entries):
+    """
+    Yield a deflated ZIP archive chunk by chunk as (filename, bytes) entries arrive.
+    The writer is not seekable, so zipfile writes sizes after each entry's data.
+    """
+    import zipfile
+
+    writer = ZipChunkWriter()
+    with zipfile.ZipFile(writer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for filename, content in entries:
+            zip_file.writestr(filename, content)
+            yield writer.drain()
+    yield writer.drain()  # central directory
+
+def prepare_bulk_report(data, report_type, args):
+    """
+    Parse bulk download parameters (call within the request) and partition the data by
+    author once. Returns None for an unknown report type, otherwise the ZIP's download_name, cache_params, its number of entries and
+    workbooks(), which yields (filename, xlsx bytes) per author: cached ones first, then
+    as the export pool finishes them.
+    """
+    from concurrent.futures import as_completed
+    from utils import get_cached_result, store_result, get_export_pool
+
+    # Only the detailed timesheet has a per-author bulk download
+    if report_type != 'detailed':
+        return None
+
+    df = data['df']
+    base_url = data['base_url']
+    holidays = data.get('holidays', [])
+    
+    # Get selected authors from URL params or session
+    selected_authors = args.getlist('author') or session.get('selected_authors', ['All'])
+    
+    # If specific authors are selected, filter the dataframe
+    if selected_authors and 'All' not in selected_authors:
+        df = df[df['Author'].isin(selected_authors)]
+    
+    selected_category = args.get('category_type', 'Activity')
+    check_category_column(df, selected_category)
+    working_days_param = args.get('working_days', '')
+    working_days = working_days_param.split(',') if working_days_param else ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+    # Partition the data by author once (the workbooks are built in the export pool)
+    check_memory(data, df)
+    author_frames = list(df.groupby('Author', observed=True, sort=False))
+
+    def author_params(author):
+        return {'author': author, 'category': selected_category, 'base_url': base_url,
+                'working_days': working_days, 'holidays': holidays}
+
+    # Parameters of the whole ZIP (for background jobs keeping it in the result cache)
+    cache_params = {'authors': selected_authors, 'category': selected_category, 'base_url': base_url,
+                    'working_days': working_days, 'holidays': holidays}
+
+    def workbooks():
+        pending = {}
+        for author, author_df in author_frames:
+            # Per-author workbooks are memoized like /download reports
+            excel_bytes = get_cached_result(data['file_id'], 'bulk_detailed', author_params(author))
+            if excel_bytes is not None:
+                yield bulk_timesheet_filename(author), excel_bytes
+            else:
+                future = get_export_pool().submit(
+                    build_timesheet_workbook, author_df, base_url, selected_category, working_days, holidays
+                )
+                pending[future] = author
+        for future in as_completed(pending):
+            author = pending[future]
+            excel_bytes = future.result()
+            store_result(data['file_id'], 'bulk_detailed', author_params(author), excel_bytes)
+            yield bulk_timesheet_filename(author), excel_bytes
+
+    return {
+        'download_name': f"individual_timesheets_{len(author_frames)}_authors.zip",
+        'cache_params': cache_params,
+        'entries': len(author_frames),
+        'workbooks': workbooks,
+    }
+
 @app.route('/download_bulk/<report_type>')
 def download_bulk_reports(report_type):
     """
@@ -1521,120 +2464,151 @@ def download_bulk_reports(report_type):
     Creates separate Excel files for each author
     """
     try:
-        # Get session data
         data = get_session_data()
-        df = data['df']
-        base_url = data['base_url']
-        holidays = data.get('holidays', [])
-        
-        # Get selected authors from URL params or session
-        selected_authors = request.args.getlist('author') or session.get('selected_authors', ['All'])
-        
-        # If specific authors are selected, filter the dataframe
-        if selected_authors and 'All' not in selected_authors:
-            df = df[df['Author'].isin(selected_authors)].copy()
-        
-        selected_category = request.args.get('category_type', 'Activity')
-        leave_days = float(request.args.get('leave_days', 0))
-        holiday_days = float(request.args.get('holiday_days', 0))
-        working_hours = float(request.args.get('working_hours', 8))
-        working_days_param = request.args.get('working_days', '')
-        working_days = working_days_param.split(',') if working_days_param else ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        
-        # Create a ZIP file containing individual Excel files
-        import zipfile
-        import tempfile
-        import os
-        
-        # Create a temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_buffer = BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for author in df['Author'].unique():
-                    # Filter data for this author
-                    author_df = df[df['Author'] == author].copy()
-                    
-                    if report_type == 'detailed':
-                        output_df, _ = process_timesheet(
-                            author_df, base_url, selected_category,
-                            working_days, holidays
-                        )
-                        
-                        # Create individual Excel file for this author
-                        excel_buffer = BytesIO()
-                        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                            output_df.to_excel(writer, index=False, sheet_name='Timesheet')
-                        
-                        # Clean author name for filename
-                        clean_author_name = str(author).replace('/', '_').replace('\\', '_').replace('[', '').replace(']', '').replace('*', '').replace('?', '').replace(':', '').replace('<', '').replace('>', '').replace('|', '')
-                        filename = f"{clean_author_name}_timesheet.xlsx"
-                        
-                        # Add the Excel file to ZIP
-                        excel_buffer.seek(0)
-                        zip_file.writestr(filename, excel_buffer.getvalue())
-            
-            zip_buffer.seek(0)
-            download_name = f"individual_timesheets_{len(df['Author'].unique())}_authors.zip"
-            
-            return send_file(
-                zip_buffer,
-                as_attachment=True,
-                download_name=download_name,
-                mimetype='application/zip'
-            )
     except DataNotFoundError:
         return redirect(url_for('index'))
+
+    report = prepare_bulk_report(data, report_type, request.args)
+    if report is None:
+        return "Invalid report type", 404
+    return Response(
+        stream_zip(report['workbooks']()),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{report["download_name"]}"'}
+    )
+
+def prepare_report(data, report_type, args):
+    """
+    Parse download parameters for a report (call within the request; the session's
+    selections are the defaults). Returns None for an unknown report type, otherwise the
+    report's type, cache_params and xlsx download_name with build_table (parquet),
+    build_chunks (csv/ndjson, an iterator of DataFrames) and build_workbook (xlsx),
+    which can run outside the request, and check_memory, which raises MemoryLimitError
+    if building could pass the ceiling.
+    """
+    df = data['df']
+    base_url = data['base_url']
+    holidays = data.get('holidays', [])
+
+    # Get selected authors from URL params or session
+    selected_authors = args.getlist('author') or session.get('selected_authors', ['All'])
+    selected_category = args.get('category_type', session.get('selected_category', 'Activity'))
+    selected_summary_type = args.get('summary_type', session.get('selected_summary_type', 'Issue Summary'))
+    custom_column = args.get('custom_column', '')
+    
+    # Handle working_days parameter
+    working_days_param = args.get('working_days', '')
+    working_days = (
+        working_days_param.split(',')
+        if isinstance(working_days_param, str) and working_days_param
+        else ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+    )
+
+    # Handle custom column selection
+    if selected_category not in ['Activity', 'Label'] and selected_category != 'Activity':
+        custom_column = selected_category
+    elif selected_category == 'Custom' and custom_column:
+        selected_category = custom_column
+    check_category_column(df, selected_category)
+
+    # Filter dataframe based on selected authors
+    if selected_authors and 'All' not in selected_authors:
+        display_df = df[df['Author'].isin(selected_authors)]
+    else:
+        display_df = df
+
+    report_params = {
+        'authors': selected_authors if 'All' not in selected_authors else ['All'],
+        'category': selected_category,
+        'summary_type': selected_summary_type,
+    }
+
+    # Each report is a table (for csv/parquet/ndjson) and a workbook (xlsx)
+    if report_type == 'detailed':
+        def build_table():
+            output_df, _ = process_timesheet(
+                display_df, base_url, selected_category,
+                working_days, holidays
+            )
+            return output_df
+
+        def build_chunks():
+            # Rows are produced chunk by chunk as they are streamed
+            return timesheet_chunks(display_df, base_url, selected_category, working_days, EXPORT_CHUNK_ROWS)
+
+        def build_workbook():
+            return write_timesheet_workbook(build_table(), 'Detailed Timesheet')
+
+        cache_params = dict(report_params, base_url=base_url, working_days=working_days, holidays=holidays)
+        download_name = session.get('fileName', 'timesheet.xlsx').rsplit('.', 1)[0] + "_detailed.xlsx"
     
-    # Get session data
-    df_json = session.get('user_df')
-    if not df_json:
-        return redirect(url_for('index'))
-    df = pd.read_json(df_json)
-    base_url = session.get('user_base_url', '')
+    elif report_type == 'summary':
+        summary_sort_by = args.get('summary_sort_by', 'Author')
+
+        def build_table():
+            return process_summary(display_df, selected_category, selected_summary_type, summary_sort_by)
 
-    # Get all unique authors
-    all_authors = df['Author'].unique()
+        def build_workbook():
+            table = build_table()
+            file_io = BytesIO()
+            with timed_stage('write_summary_workbook'):
+                table.to_excel(file_io, index=False, sheet_name='Summary Report')
+            return file_io.getvalue()
+
+        cache_params = dict(report_params, sort_by=summary_sort_by)
+        download_name = "jira_summary.xlsx"
     
-    # Create a ZIP file containing individual Excel files
-    import zipfile
-    import tempfile
-    import os
+    elif report_type == 'sprint_closure':
+        # Flat formats carry the features table (estimated vs actual effort per user)
+        def build_table():
+            return sprint_closure_tables(display_df, selected_summary_type)[2]
+
+        def build_workbook():
+            return process_sprint_closure_report(display_df, selected_summary_type).getvalue()
+
+        cache_params = report_params
+        download_name = "sprint_closure_report.xlsx"
     
-    # Create a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        zip_buffer = BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for author in all_authors:
-                # Filter data for this author
-                author_df = df[df['Author'] == author].copy()
-                
-                if report_type == 'detailed':
-                    output_df, _ = process_timesheet(author_df, base_url, selected_category, working_days, holidays)
-                    
-                    # Create individual Excel file for this author
-                    excel_buffer = BytesIO()
-                    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                        output_df.to_excel(writer, index=False, sheet_name='Timesheet')
-                    
-                    # Clean author name for filename
-                    clean_author_name = str(author).replace('/', '_').replace('\\', '_').replace('[', '').replace(']', '').replace('*', '').replace('?', '').replace(':', '').replace('<', '').replace('>', '').replace('|', '')
-                    filename = f"{clean_author_name}_timesheet.xlsx"
-                    
-                    # Add the Excel file to ZIP
-                    excel_buffer.seek(0)
-                    zip_file.writestr(filename, excel_buffer.getvalue())
-        
-        zip_buffer.seek(0)
-        download_name = f"individual_timesheets_{len(all_authors)}_authors.zip"
-        
-        return send_file(
-            zip_buffer,
-            as_attachment=True,
-            download_name=download_name,
-            mimetype='application/zip'
-        )
+    else:
+        return None
+
+    if report_type != 'detailed':
+        build_chunks = lambda: table_chunks(build_table)
+
+    return {
+        'type': report_type,
+        'cache_params': cache_params,
+        'download_name': download_name,
+        'build_table': build_table,
+        'build_chunks': build_chunks,
+        'build_workbook': build_workbook,
+        'check_memory': lambda: check_memory(data, display_df),
+    }
+
+def report_download_name(report, export_format):
+    """Download file name of a prepared report in the given format."""
+    return report['download_name'].rsplit('.', 1)[0] + '.' + export_format
+
+def report_file(file_id, report, export_format):
+    """File contents of a prepared report in the given format, memoized per dataset and parameters."""
+    from utils import cached_result, to_parquet_bytes
+
+    if export_format == 'xlsx':
+        build = report['build_workbook']
+    elif export_format == 'parquet':
+        build = lambda: to_parquet_bytes(report['build_table']())
+    else:
+        build = lambda: ''.join(stream_table(report['build_chunks'](), export_format)).encode('utf-8')
+
+    def build_within_limit():
+        report['check_memory']()
+        return build()
+
+    return cached_result(file_id, report_cache_kind(report, export_format), report['cache_params'], build_within_limit)
+
+def report_cache_kind(report, export_format):
+    """Result cache kind of a prepared report's file in the given format."""
+    return f"download_{report['type']}" if export_format == 'xlsx' else f"download_{report['type']}_{export_format}"
 
 @app.route('/download/<report_type>')
 def download_report(report_type):
@@ -1643,78 +2617,171 @@ def download_report(report_type):
     The data is filtered based on the 'author' query parameter.
     """
     try:
-        # Get session data
         data = get_session_data()
-        df = data['df']
-        base_url = data['base_url']
-        holidays = data.get('holidays', [])
+    except DataNotFoundError:
+        return redirect(url_for('index'))
 
-        # Get selected authors from URL params or session
-        selected_authors = request.args.getlist('author') or session.get('selected_authors', ['All'])
-        selected_category = request.args.get('category_type', session.get('selected_category', 'Activity'))
-        selected_summary_type = request.args.get('summary_type', session.get('selected_summary_type', 'Issue Summary'))
-        custom_column = request.args.get('custom_column', '')
-        leave_days = float(request.args.get('leave_days', 0))
-        holiday_days = float(request.args.get('holiday_days', 0))
-        working_hours = float(request.args.get('working_hours', 8))
-        
-        # Handle working_days parameter
-        working_days_param = request.args.get('working_days', '')
-        working_days = (
-            working_days_param.split(',')
-            if isinstance(working_days_param, str) and working_days_param
-            else ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+    export_format = request.args.get('format', 'xlsx').lower()
+    if export_format not in EXPORT_MIMETYPES:
+        return "Invalid export format", 400
+
+    report = prepare_report(data, report_type, request.args)
+    if report is None:
+        return "Invalid report type", 404
+
+    if export_format in ('csv', 'ndjson'):
+        # Text formats are built and streamed chunk by chunk, and not cached
+        report['check_memory']()
+        return Response(
+            stream_table(report['build_chunks'](), export_format),
+            mimetype=EXPORT_MIMETYPES[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{report_download_name(report, export_format)}"'}
         )
 
-        # Handle custom column selection
-        if selected_category not in ['Activity', 'Label'] and selected_category != 'Activity':
-            custom_column = selected_category
-        elif selected_category == 'Custom' and custom_column:
-            selected_category = custom_column
+    return send_file(
+        BytesIO(report_file(data['file_id'], report, export_format)),
+        as_attachment=True,
+        download_name=report_download_name(report, export_format),
+        mimetype=EXPORT_MIMETYPES[export_format]
+    )
 
-        # Filter dataframe based on selected authors
-        if selected_authors and 'All' not in selected_authors:
-            display_df = df[df['Author'].isin(selected_authors)].copy()
-            author_label = ", ".join(selected_authors)
-        else:
-            display_df = df.copy()
-            author_label = "All"
+@app.route('/jobs/download/<report_type>', methods=['POST'])
+def submit_report_job(report_type):
+    """
+    Queue a /download report (same parameters, as query string or form fields) as a
+    background job. Returns the job id with its status and result URLs.
+    """
+    from utils import submit_job, get_cached_result
 
-        # Generate the requested file
-        if report_type == 'detailed':
-            output_df, _ = process_timesheet(
-                display_df.copy(), base_url, selected_category,
-                working_days, holidays
-            )
-            file_io = BytesIO()
-            output_df.to_excel(file_io, index=False, sheet_name='Detailed Timesheet')
-            file_io.seek(0)
-            download_name = session.get('fileName', 'timesheet.xlsx').rsplit('.', 1)[0] + "_detailed.xlsx"
-        
-        elif report_type == 'summary':
-            summary_sort_by = request.args.get('summary_sort_by', 'Author')
-            summary_df = process_summary(display_df.copy(), selected_category, selected_summary_type, summary_sort_by)
-            file_io = BytesIO()
-            summary_df.to_excel(file_io, index=False, sheet_name='Summary Report')
-            file_io.seek(0)
-            download_name = "jira_summary.xlsx"
-        
-        elif report_type == 'sprint_closure':
-            file_io = process_sprint_closure_report(display_df.copy(), selected_summary_type)
-            download_name = "sprint_closure_report.xlsx"
-        
-        else:
-            return "Invalid report type", 404
+    try:
+        data = get_session_data()
+    except DataNotFoundError:
+        return jsonify({'error': 'No data in session'}), 404
 
-        return send_file(
-            file_io,
-            as_attachment=True,
-            download_name=download_name,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+    export_format = request.values.get('format', 'xlsx').lower()
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({'error': 'Invalid export format'}), 400
+
+    report = prepare_report(data, report_type, request.values)
+    if report is None:
+        return jsonify({'error': 'Invalid report type'}), 404
+
+    # Reject up front (503 with Retry-After) rather than queue a job that can't run;
+    # cached results are served regardless, as by /download
+    if get_cached_result(data['file_id'], report_cache_kind(report, export_format), report['cache_params']) is None:
+        report['check_memory']()
 
+    def run(advance):
+        content = report_file(data['file_id'], report, export_format)
+        advance()
+        return job_output(data['file_id'], report_cache_kind(report, export_format), report['cache_params'],
+                          content, report_download_name(report, export_format), EXPORT_MIMETYPES[export_format])
+
+    return job_submitted(submit_job(data['file_id'], run))
+
+@app.route('/jobs/download_bulk/<report_type>', methods=['POST'])
+def submit_bulk_job(report_type):
+    """Queue a /download_bulk ZIP as a background job; progress counts finished authors."""
+    from utils import submit_job
+
+    try:
+        data = get_session_data()
     except DataNotFoundError:
-        return redirect(url_for('index'))
+        return jsonify({'error': 'No data in session'}), 404
+
+    report = prepare_bulk_report(data, report_type, request.values)
+    if report is None:
+        return jsonify({'error': 'Invalid report type'}), 404
+
+    def run(advance):
+        def entries():
+            for entry in report['workbooks']():
+                advance()
+                yield entry
+        return job_output(data['file_id'], f"bulk_{report_type}_zip", report['cache_params'],
+                          b''.join(stream_zip(entries())), report['download_name'], 'application/zip')
+
+    return job_submitted(submit_job(data['file_id'], run, total=report['entries']))
+
+def job_output(file_id, kind, params, content, download_name, mimetype):
+    """
+    A finished job's result: where its file is in the result cache, with its download
+    name and mimetype. Files too large for the cache are kept in the result until fetched.
+    """
+    from utils import store_result
+
+    result = {'cache_kind': kind, 'cache_params': params, 'download_name': download_name, 'mimetype': mimetype}
+    if not store_result(file_id, kind, params, content):
+        result['content'] = content
+    return result
+
+def job_submitted(job_id):
+    """202 response for a newly queued job."""
+    return jsonify({
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id),
+        'result_url': url_for('job_result', job_id=job_id),
+    }), 202
+
+def session_job(job_id):
+    """The job if it belongs to the current session's dataset, else None."""
+    from utils import get_job
+
+    job = get_job(job_id)
+    if job is None or job['file_id'] != session.get('file_id'):
+        return None
+    return job
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Status and progress of a background report job."""
+    job = session_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    status = {
+        'job_id': job_id,
+        'status': job['status'],
+        'completed': job['completed'],
+        'total': job['total'],
+        'progress': round(job['completed'] / job['total'], 2) if job['total'] else 1.0,
+    }
+    if job['status'] == 'done':
+        status['result_url'] = url_for('job_result', job_id=job_id)
+    elif job['status'] == 'failed':
+        status['error'] = job['error']
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Download the file produced by a finished job."""
+    job = session_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == 'failed':
+        if issubclass(job['error_type'], MemoryLimitError):
+            # The ceiling was reached by the time the job ran: retryable, like a rejection
+            raise MemoryLimitError(job['error'])
+        return jsonify({'error': job['error']}), 500
+    if job['status'] != 'done':
+        return jsonify({'status': job['status']}), 409
+
+    from utils import get_cached_result, drop_job_content
+
+    result = job['result']
+    content = result.get('content')
+    if content is None:
+        content = get_cached_result(job['file_id'], result['cache_kind'], result['cache_params'])
+        if content is None:
+            return jsonify({'error': 'Job result expired, submit the job again'}), 410
+    else:
+        drop_job_content(job_id)
+    return send_file(
+        BytesIO(content),
+        as_attachment=True,
+        download_name=result['download_name'],
+        mimetype=result['mimetype']
+    )
     
     # # Handle custom column selection - check if it's a custom column name directly
     # if selected_category not in ['Activity', 'Label'] and selected_category != 'Activity':
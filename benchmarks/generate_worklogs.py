@@ -0,0 +1,146 @@
+"""
+Deterministic generator of synthetic Jira worklog exports, shaped like the
+exports /process accepts (stories with sub-tasks, labels, activities, weekend
+and holiday work). The same rows and seed always produce the same data.
+
+    python benchmarks/generate_worklogs.py --rows 100000 --output worklogs_100k.csv
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+PROJECTS = ['Apollo', 'Borealis', 'Cygnus']
+ISSUE_STATUSES = ['To Do', 'In Progress', 'In Review', 'Done']
+PRIORITIES = ['Lowest', 'Low', 'Medium', 'High', 'Highest']
+LABELS = ['Backend', 'Frontend', 'Mobile', 'Infra', 'QA', 'Support']
+ACTIVITIES = ['Development', 'Code Review', 'Testing', 'Meeting', 'Documentation', 'Design']
+
+WORKLOGS_PER_AUTHOR_DAY = 4
+WEEKEND_SHARE = 0.03   # worklogs moved to a Saturday or Sunday
+HOLIDAY_SHARE = 0.01   # worklogs moved to a public holiday
+EMPTY_SHARE = 0.12     # worklogs without a label (and, separately, an activity)
+
+def _size(rows):
+    """Authors and calendar days for a dataset of `rows` worklogs."""
+    authors = int(np.clip(rows // 2500, 8, 400))
+    working_days = max(rows // (authors * WORKLOGS_PER_AUTHOR_DAY), 20)
+    return authors, int(working_days * 7 / 5) + 1
+
+def generate_holidays(start, days, seed=0):
+    """About ten public holidays per year, all on weekdays."""
+    rng = np.random.default_rng(seed + 1)
+    calendar = pd.date_range(start, periods=days, freq='D')
+    weekdays = calendar[calendar.weekday < 5]
+    count = min(max(days * 10 // 365, 1), len(weekdays))
+    picked = np.sort(rng.choice(len(weekdays), size=count, replace=False))
+    return [day.strftime('%Y-%m-%d') for day in weekdays[picked]]
+
+def generate_worklogs(rows, seed=0, start='2024-01-01'):
+    """
+    Synthetic Jira worklog export with `rows` worklogs. Returns the export as a
+    DataFrame (Jira's column names, dates as 'YYYY-MM-DD HH:MM' text) and the
+    holidays (YYYY-MM-DD) used to place holiday work.
+    """
+    rng = np.random.default_rng(seed)
+    n_authors, days = _size(rows)
+    holidays = generate_holidays(start, days, seed)
+
+    # Issues: stories with sub-tasks, plus standalone tasks and bugs
+    n_issues = max(rows // 20, 10)
+    n_stories = max(n_issues // 8, 1)
+    issue_project = rng.integers(0, len(PROJECTS), n_issues)
+    issue_keys = np.array([f"{PROJECTS[p][:3].upper()}-{i + 1}" for i, p in enumerate(issue_project)])
+    issue_types = np.where(np.arange(n_issues) < n_stories, 'Story',
+                           rng.choice(['Sub-task', 'Sub-task', 'Task', 'Bug'], n_issues))
+    parent_of = rng.integers(0, n_stories, n_issues)
+    has_parent = issue_types == 'Sub-task'
+    parent_keys = np.where(has_parent, issue_keys[parent_of], None)
+    parent_summaries = np.where(has_parent, np.char.add('Story ', parent_of.astype(str)), None)
+    estimates = rng.integers(1, 17, n_issues) * 1800.0
+    estimates[rng.random(n_issues) < 0.2] = np.nan
+
+    # Worklogs: work is clustered on a few issues per author
+    issue = np.minimum((rng.pareto(1.2, rows) * n_issues / 20).astype(np.int64), n_issues - 1)
+    issue = (issue + rng.integers(0, n_issues, rows) * (rng.random(rows) < 0.5)) % n_issues
+    issue = rng.permutation(n_issues)[issue]
+    authors = np.array([f"Engineer {i + 1:03d}" for i in range(n_authors)], dtype=object)
+    author = rng.integers(0, n_authors, rows)
+
+    # Start dates: weekdays in business hours, some weekend and holiday work
+    calendar = pd.date_range(start, periods=days, freq='D')
+    weekdays = np.flatnonzero((calendar.weekday < 5) & ~calendar.strftime('%Y-%m-%d').isin(holidays))
+    weekends = np.flatnonzero(calendar.weekday >= 5)
+    holiday_days = np.flatnonzero(calendar.strftime('%Y-%m-%d').isin(holidays))
+    day = weekdays[rng.integers(0, len(weekdays), rows)]
+    placement = rng.random(rows)
+    weekend_work = placement < WEEKEND_SHARE
+    day[weekend_work] = weekends[rng.integers(0, len(weekends), weekend_work.sum())]
+    holiday_work = (placement >= WEEKEND_SHARE) & (placement < WEEKEND_SHARE + HOLIDAY_SHARE)
+    if len(holiday_days):
+        day[holiday_work] = holiday_days[rng.integers(0, len(holiday_days), holiday_work.sum())]
+    minute = rng.integers(9 * 4, 18 * 4, rows) * 15
+    start_dates = calendar[day] + pd.to_timedelta(minute, unit='min')
+
+    # Time spent: mostly short entries in quarter hours, up to a full day
+    quarters = np.clip(np.round(rng.gamma(2.0, 3.0, rows)), 1, 32).astype(np.int64)
+
+    labels = np.array(LABELS, dtype=object)[rng.integers(0, len(LABELS), rows)]
+    labels[rng.random(rows) < EMPTY_SHARE] = None
+    activities = np.array(ACTIVITIES, dtype=object)[rng.integers(0, len(ACTIVITIES), rows)]
+    activities[rng.random(rows) < EMPTY_SHARE] = None
+
+    # Exports occasionally carry stray whitespace around author names
+    author_names = authors[author]
+    padded = rng.random(rows) < 0.01
+    author_names[padded] = np.char.add(np.char.add(' ', author_names[padded].astype(str)), ' ')
+
+    worklogs = pd.DataFrame({
+        'Issue Key': issue_keys[issue],
+        'Issue Summary': np.char.add('Issue ', issue.astype(str)),
+        'Issue Type': issue_types[issue],
+        'Issue Status': np.array(ISSUE_STATUSES)[issue % len(ISSUE_STATUSES)],
+        'Parent Key': parent_keys[issue],
+        'Parent Summary': parent_summaries[issue],
+        'Project Name': np.array(PROJECTS)[issue_project[issue]],
+        'Priority': np.array(PRIORITIES)[issue % len(PRIORITIES)],
+        'Author': author_names,
+        'Start Date': start_dates.strftime('%Y-%m-%d %H:%M'),
+        'Time Spent (seconds)': quarters * 900,
+        'Comment': np.char.add('Worked on issue ', issue.astype(str)),
+        'Labels': labels,
+        'Activity': activities,
+        'Original Estimate (seconds)': estimates[issue],
+        'Remaining Estimate (seconds)': np.maximum(estimates[issue] - quarters * 900, 0),
+        'Worklog Id': np.arange(1, rows + 1) + 10_000_000,
+    })
+    worklogs = worklogs.sort_values('Start Date', kind='stable', ignore_index=True)
+    return worklogs, holidays
+
+def parse_rows(value):
+    """Row count from the command line: 10000, 10k or 1m."""
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', default='10k', help='number of worklogs, e.g. 10k, 100k, 1m')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help='.csv or .xlsx file to write')
+    parser.add_argument('--holidays', help='also write the holidays as a JSON list to this file')
+    args = parser.parse_args()
+
+    worklogs, holidays = generate_worklogs(parse_rows(args.rows), args.seed)
+    if args.output.lower().endswith('.xlsx'):
+        worklogs.to_excel(args.output, index=False)
+    else:
+        worklogs.to_csv(args.output, index=False)
+    if args.holidays:
+        with open(args.holidays, 'w') as f:
+            json.dump(holidays, f)
+    print(f"Wrote {len(worklogs)} worklogs by {worklogs['Author'].str.strip().nunique()} authors to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Micro-benchmarks for the report processing functions on synthetic worklogs
+(see generate_worklogs.py). Each function is timed (best of --repeat runs) and
+its peak Python/NumPy allocation measured with tracemalloc, then compared with
+the stored baseline; a slowdown or memory growth beyond --tolerance fails the run.
+
+    python benchmarks/run_benchmarks.py                      # 10k and 100k rows
+    python benchmarks/run_benchmarks.py --sizes 10k,100k,1m
+    python benchmarks/run_benchmarks.py --save-baseline      # after an intended change
+
+Timings depend on the machine, so keep the baseline from the machine that runs
+the comparison (e.g. the deploy pipeline's runner).
+"""
+import argparse
+import atexit
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+sys.path.insert(0, REPO_DIR)
+
+from generate_worklogs import generate_worklogs, parse_rows
+
+WORKING_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+WORKING_HOURS = 8
+
+def import_app():
+    """Import the Flask app from a scratch directory: it resets ./temp_data on import."""
+    scratch = tempfile.mkdtemp(prefix='timesheet-bench-')
+    atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+    os.chdir(scratch)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    return app
+
+def benchmark_cases(app, export, holidays):
+    """(name, function) pairs, called with the inputs the routes pass them."""
+    csv = export.to_csv(index=False).encode()
+    df = app.parse_worklog_file(io.BytesIO(csv), 'worklogs.csv')
+    cube = app.build_daily_cube(df)
+    return [
+        ('parse_worklog_file', lambda: app.parse_worklog_file(io.BytesIO(csv), 'worklogs.csv')),
+        ('build_daily_cube', lambda: app.build_daily_cube(df)),
+        ('process_timesheet', lambda: app.process_timesheet(
+            df, 'https://jira.example.com/browse/', 'Activity', WORKING_DAYS, holidays)),
+        ('process_summary', lambda: app.process_summary(df, 'Activity', 'Issue Summary', 'Author')),
+        ('calculate_overtime_hours', lambda: app.calculate_overtime_hours(
+            cube, 0, 0, WORKING_HOURS, WORKING_DAYS, holidays)),
+        ('calculate_weekly_overtime', lambda: app.calculate_weekly_overtime(
+            cube, WORKING_HOURS, WORKING_DAYS, holidays)),
+        ('process_sprint_closure_report', lambda: app.process_sprint_closure_report(df, 'Issue Summary')),
+        ('availableCapacity', lambda: app.availableCapacity(
+            cube, None, WORKING_HOURS, WORKING_DAYS, holidays, 'Activity')),
+        ('getStoryAndTaskCount', lambda: app.getStoryAndTaskCount(df)),
+    ]
+
+def measure(function, repeat):
+    """Best wall time over `repeat` runs and peak traced allocation of one more run (MB)."""
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(min(seconds), 4), 'peak_mb': round(peak / 2**20, 2)}
+
+def run(sizes, repeat, only=None):
+    app = import_app()
+    results = {}
+    for rows in sizes:
+        export, holidays = generate_worklogs(rows)
+        label = str(rows)
+        results[label] = {}
+        for name, function in benchmark_cases(app, export, holidays):
+            if only and name not in only:
+                continue
+            # Large datasets get a single timed run
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[label][name] = measure(function, repeat if rows < 1_000_000 else 1)
+            result = results[label][name]
+            print(f"{rows:>9} rows  {name:<30} {result['seconds']:>9.3f} s  {result['peak_mb']:>9.1f} MB", flush=True)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Regressions against the baseline, as printable lines."""
+    regressions = []
+    for size, functions in results.items():
+        for name, result in functions.items():
+            expected = baseline.get('results', {}).get(size, {}).get(name)
+            if expected is None:
+                continue
+            for metric, unit in (('seconds', 's'), ('peak_mb', 'MB')):
+                # Ignore noise on measurements too small to matter
+                floor = 0.01 if metric == 'seconds' else 1.0
+                if result[metric] > max(expected[metric], floor) * (1 + tolerance):
+                    regressions.append(f"{size} rows {name}: {metric} {result[metric]} {unit} "
+                                       f"(baseline {expected[metric]} {unit})")
+    return regressions
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10k,100k', help='comma-separated row counts, e.g. 10k,100k,1m')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per function (best is kept)')
+    parser.add_argument('--only', help='comma-separated function names to run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown/memory growth (0.25 = 25%%)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--output', help='also write the results as JSON to this file')
+    args = parser.parse_args()
+
+    sizes = [parse_rows(size) for size in args.sizes.split(',')]
+    only = set(args.only.split(',')) if args.only else None
+    report = {'environment': environment(), 'results': run(sizes, args.repeat, only)}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline['environment'] = report['environment']
+        for size, functions in report['results'].items():
+            baseline['results'].setdefault(size, {}).update(functions)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != report['environment']:
+        print(f"Note: baseline was recorded on {baseline.get('environment')}")
+
+    regressions = compare(report['results'], baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -412,7 +412,14 @@ function setDefaultRadioButtons() {
 }
 
 // DOM Ready
-document.addEventListener("DOMContentLoaded", async function () {
+document.addEventListener("DOMContentLoaded", function () {
+  // Dashboard panels are requested right away and load even if the rest of the
+  // page's initialization fails; each is filled in once that has settled
+  const pageInitialized = initializePage();
+  loadDashboardPanels(pageInitialized);
+});
+
+async function initializePage() {
   try {
     // First initialize the database
     await initializeDB();
@@ -467,7 +474,7 @@ document.addEventListener("DOMContentLoaded", async function () {
     //   "Failed to initialize the application. Please refresh the page or contact support if the issue persists.";
     // document.body.insertBefore(errorDiv, document.body.firstChild);
   }
-});
+}
 
 function setupEventListeners() {
   // Set up form submission handler
@@ -983,6 +990,54 @@ function resetHolidays() {
   }).then(() => renderHolidayCalendar(selectedMonth, selectedYear));
 }
 
+// --- Lazy dashboard panels ---
+// Each panel placeholder is filled from /api/panels/<name> with the page's
+// query string; panels are requested in parallel and shown as they arrive,
+// once `ready` (the page's initialization) has settled.
+async function loadDashboardPanels(ready = Promise.resolve()) {
+  if (!window.serverData?.lazyPanels) return;
+
+  const containers = document.querySelectorAll(".dashboard-panel[data-panel-url]");
+  await Promise.all(
+    Array.from(containers).map((container) => loadDashboardPanel(container, ready))
+  );
+}
+
+async function loadDashboardPanel(container, ready) {
+  const name = container.dataset.panel;
+  try {
+    const response = await fetch(
+      container.dataset.panelUrl + window.location.search
+    );
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}`);
+    }
+    const panel = await response.json();
+    // Toggle states are restored (and saved) during initialization
+    await ready.catch(() => {});
+    container.innerHTML = panel.html;
+
+    if (name === "category_totals") {
+      serverData.categoryData = panel.data.category_totals;
+      if (serverData.categoryData?.length) initializeCategoryPieChart();
+    } else if (name === "weekly_overtime") {
+      serverData.weeklyOvertimeData = panel.data.weekly_overtime_data;
+      if (document.getElementById("weeklyOvertimeChart")) {
+        initializeWeeklyOvertimeChart();
+      }
+    } else if (name === "summary") {
+      paginationSummaryTable();
+    }
+
+    // Injected sections start hidden; apply the current toggle states
+    toggleAuthorSubtaskUI();
+    toggleCapacityUI();
+    toggleOvertimeUI();
+  } catch (error) {
+    console.error(`Failed to load dashboard panel ${name}:`, error);
+  }
+}
+
 // --- Chart Logic ---
 function initializeCharts() {
   //console.log("Initializing initializeCharts...");
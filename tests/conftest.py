@@ -0,0 +1,45 @@
+"""
+Shared fixtures. The app is imported from a scratch directory because it resets
+./temp_data on import; the synthetic exports come from benchmarks/generate_worklogs.py.
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'benchmarks'))
+
+from generate_worklogs import generate_worklogs
+
+@pytest.fixture(scope='session')
+def app_module():
+    scratch = tempfile.mkdtemp(prefix='timesheet-tests-')
+    previous = os.getcwd()
+    os.chdir(scratch)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    yield app
+    os.chdir(previous)
+    shutil.rmtree(scratch, ignore_errors=True)
+
+@pytest.fixture
+def client(app_module):
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        yield client
+
+def export_csv(df):
+    """A worklog export as the uploaded CSV bytes."""
+    return df.to_csv(index=False).encode()
+
+@pytest.fixture(scope='session')
+def export_5k():
+    """The 5k-row synthetic Jira export (DataFrame, holidays)."""
+    return generate_worklogs(5000)
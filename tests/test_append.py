@@ -0,0 +1,53 @@
+import io
+
+from conftest import export_csv
+
+def post_export(client, url, export, **fields):
+    response = client.post(url, data={'file': (io.BytesIO(export_csv(export)), 'export.csv'), **fields},
+                           content_type='multipart/form-data')
+    assert response.status_code == 302
+
+def stored_rows(client):
+    import utils
+    with client.session_transaction() as session:
+        file_id = session['file_id']
+    utils._uncache_dataframe(file_id)
+    return utils.load_dataframe(file_id)
+
+def test_append_matches_ids_when_stored_ids_are_missing(app_module, client, export_5k):
+    export = export_5k[0]
+    stored = export.iloc[:3000].copy()
+    stored.loc[stored.index[:10], 'Worklog Id'] = None  # read back as floats
+
+    post_export(client, '/process', stored, base_url='https://jira/browse/')
+    post_export(client, '/process_append', export.iloc[2000:])
+
+    assert len(stored_rows(client)) == len(export)
+
+def test_appended_parts_load_without_scanning_temp_dir(app_module, client, export_5k, monkeypatch):
+    import utils
+    export = export_5k[0]
+    post_export(client, '/process', export.iloc[:2000], base_url='https://jira/browse/')
+    post_export(client, '/process_append', export.iloc[2000:4000])
+    post_export(client, '/process_append', export.iloc[4000:])
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError('TEMP_DIR scanned')
+    monkeypatch.setattr(utils.glob, 'glob', no_scan)
+    monkeypatch.setattr(utils.os, 'listdir', no_scan)
+    df = stored_rows(client)
+    assert len(df) == len(export)
+    assert df['Worklog Id'].astype('int64').tolist() == export['Worklog Id'].tolist()
+
+def test_append_hashes_only_new_worklogs(app_module, client, export_5k, monkeypatch):
+    export = export_5k[0]
+    post_export(client, '/process', export.iloc[:3000], base_url='https://jira/browse/')
+
+    hashed = []
+    worklog_keys = app_module.worklog_keys
+    monkeypatch.setattr(app_module, 'worklog_keys', lambda df, *args, **kwargs: hashed.append(len(df)) or worklog_keys(df, *args, **kwargs))
+    post_export(client, '/process_append', export.iloc[2000:4000])
+    post_export(client, '/process_append', export.iloc[3500:])
+
+    assert max(hashed) <= 2000
+    assert len(stored_rows(client)) == len(export)
@@ -0,0 +1,41 @@
+import io
+
+import numpy as np
+
+from conftest import export_csv
+
+def upload(client, export):
+    response = client.post('/process', data={'file': (io.BytesIO(export_csv(export)), 'export.csv'),
+                                             'base_url': 'https://jira/browse/'},
+                           content_type='multipart/form-data')
+    assert response.status_code == 302
+
+def test_unlisted_low_cardinality_columns_are_kept(app_module, client, export_5k):
+    export = export_5k[0].iloc[:2000].copy()
+    export['Squad'] = np.where(np.arange(len(export)) % 2, 'Blue', 'Red')
+    export['Description'] = [f"Description {i}" for i in range(len(export))]
+    export['Story Points'] = None
+    upload(client, export)
+
+    import utils
+    with client.session_transaction() as session:
+        df = utils.load_dataframe(session['file_id'])
+    assert str(df['Squad'].dtype) == 'category'
+    assert 'Description' not in df.columns and 'Story Points' not in df.columns
+
+    response = client.get('/download/summary?format=csv&category_type=Squad')
+    assert response.status_code == 200
+    assert b'Blue' in response.data and b'Red' in response.data
+
+def test_unknown_custom_column_is_rejected(app_module, client, export_5k):
+    upload(client, export_5k[0].iloc[:2000])
+
+    for url in ('/report?category_type=Missing', '/download/summary?category_type=Missing',
+                '/download_bulk/detailed?category_type=Missing'):
+        response = client.get(url)
+        assert response.status_code == 400
+        assert b"Column 'Missing' is not in the uploaded data" in response.data
+
+    response = client.get('/api/panels/summary?category_type=Missing')
+    assert response.status_code == 400
+    assert 'Missing' in response.get_json()['error']
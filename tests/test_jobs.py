@@ -0,0 +1,88 @@
+import io
+import time
+
+from conftest import export_csv
+
+def upload(client, export):
+    response = client.post('/process', data={'file': (io.BytesIO(export_csv(export)), 'export.csv'),
+                                             'base_url': 'https://jira/browse/'},
+                           content_type='multipart/form-data')
+    assert response.status_code == 302
+
+def finish(client, job):
+    while True:
+        status = client.get(job['status_url']).get_json()
+        if status['status'] in ('done', 'failed'):
+            return status
+        time.sleep(0.05)
+
+def test_job_keeps_only_cache_key(app_module, client, export_5k):
+    import utils
+    upload(client, export_5k[0])
+    job = client.post('/jobs/download/summary').get_json()
+    assert finish(client, job)['status'] == 'done'
+    assert 'content' not in utils.get_job(job['job_id'])['result']
+
+    direct = client.get('/download/summary').data
+    assert client.get(job['result_url']).data == direct
+
+    utils.invalidate_results(utils.get_job(job['job_id'])['file_id'])
+    assert client.get(job['result_url']).status_code == 410
+
+def test_unknown_bulk_report_type_is_rejected(app_module, client, export_5k):
+    upload(client, export_5k[0].iloc[:2000])
+
+    response = client.get('/download_bulk/summary')
+    assert response.status_code == 404
+    assert response.data == b'Invalid report type'
+
+    response = client.post('/jobs/download_bulk/summary')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Invalid report type'}
+
+def test_oversized_job_result_is_released_once_fetched(app_module, client, export_5k, monkeypatch):
+    import utils
+    upload(client, export_5k[0])
+    monkeypatch.setattr(utils, 'RESULT_CACHE_MB', 0.001)
+    job = client.post('/jobs/download/summary').get_json()
+    assert finish(client, job)['status'] == 'done'
+
+    assert client.get(job['result_url']).status_code == 200
+    assert 'content' not in utils.get_job(job['job_id'])['result']
+    assert client.get(job['result_url']).status_code == 410
+
+def memory_limited_total(endpoint):
+    import utils
+    for line in utils.render_metrics().splitlines():
+        if line.startswith('timesheet_memory_limited_total{') and f'endpoint="{endpoint}"' in line:
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+def test_job_rejected_at_memory_ceiling(app_module, client, export_5k, monkeypatch):
+    import utils
+    upload(client, export_5k[0])
+    monkeypatch.setattr(utils, '_memory_limit', 2**30)
+    monkeypatch.setattr(utils, 'memory_available', lambda required_bytes: False)
+    rejected = memory_limited_total('submit_report_job')
+
+    response = client.post('/jobs/download/detailed')
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+    assert memory_limited_total('submit_report_job') == rejected + 1
+
+def test_job_reaching_memory_ceiling_is_retryable(app_module, client, export_5k, monkeypatch):
+    upload(client, export_5k[0])
+    checks = []
+
+    def check_memory(data, df):
+        # Below the ceiling when the job is queued, over it when the job runs
+        checks.append(len(df))
+        if len(checks) > 1:
+            raise app_module.MemoryLimitError('Not enough memory')
+    monkeypatch.setattr(app_module, 'check_memory', check_memory)
+
+    job = client.post('/jobs/download/detailed').get_json()
+    assert finish(client, job)['status'] == 'failed'
+    response = client.get(job['result_url'])
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
@@ -0,0 +1,37 @@
+import io
+
+from conftest import export_csv
+
+def upload(client, export):
+    response = client.post('/process', data={'file': (io.BytesIO(export_csv(export)), 'export.csv'),
+                                             'base_url': 'https://jira/browse/'},
+                           content_type='multipart/form-data')
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        return session['file_id']
+
+def test_caches_are_released_before_rejecting(app_module, export_5k, monkeypatch):
+    import utils
+    export = export_5k[0]
+    other, client = app_module.app.test_client(), app_module.app.test_client()
+    other_id = upload(other, export.iloc[:2500])
+    assert other.get('/download/summary').status_code == 200
+    file_id = upload(client, export.iloc[2500:])
+    assert client.get('/report').status_code == 200
+
+    # Over the ceiling for as long as the other session's data is cached
+    monkeypatch.setattr(utils, '_memory_limit', 2**30)
+    monkeypatch.setattr(utils, 'memory_available', lambda required_bytes: not any(
+        key[0] == other_id for cache in (utils._dataframe_cache, utils._result_cache) for key in cache))
+
+    assert client.get('/download/detailed?format=csv').status_code == 200
+    assert not any(key[0] == other_id for key in utils._dataframe_cache)
+    assert not any(key[0] == other_id for key in utils._result_cache)
+    assert any(key[0] == file_id for key in utils._dataframe_cache)
+
+def test_cache_budgets_default_to_a_share_of_the_ceiling(app_module, monkeypatch):
+    import utils
+    monkeypatch.setattr(utils, '_memory_limit', 512 * 2**20)
+    assert utils._default_cache_mb(512, 0.25) == 128
+    monkeypatch.setattr(utils, '_memory_limit', 0)
+    assert utils._default_cache_mb(512, 0.25) == 512
@@ -0,0 +1,23 @@
+import json
+import time
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+def test_profile_collects_samples(app_module, tmp_path, monkeypatch):
+    import utils
+    monkeypatch.setattr(utils, 'PROFILE_DIR', str(tmp_path))
+    profile = utils.start_profile('test')
+    busy(0.2)
+    path = utils.stop_profile(profile)
+
+    with open(path) as f:
+        document = json.load(f)
+    samples = document['profiles'][0]['samples']
+    assert samples
+    names = {frame['name'] for frame in document['shared']['frames']}
+    assert any(name.endswith('busy') for name in names)
@@ -0,0 +1,48 @@
+import io
+
+import pandas as pd
+
+from conftest import export_csv
+
+def reference_features(df, summary_col='Issue Summary'):
+    """The features table as the original per-task loop computed it."""
+    df = df.copy()
+    df['Author'] = df['Author'].str.strip()
+    df['Hours Spent'] = df['Time Spent (seconds)'] / 3600
+    df['Original Estimate'] = df['Original Estimate (seconds)'] / 3600
+    user_task_summary = df.groupby(['Labels', summary_col, 'Author']).agg({
+        'Original Estimate': 'first', 'Hours Spent': 'sum', 'Issue Status': 'first'
+    }).reset_index()
+
+    rows = []
+    for (label, summary), task_group in user_task_summary.groupby(['Labels', summary_col]):
+        total_users = len(task_group)
+        original_estimate = task_group['Original Estimate'].iloc[0]
+        total_actual_hours = task_group['Hours Spent'].sum()
+        for _, user_row in task_group.iterrows():
+            actual_hours = user_row['Hours Spent']
+            if total_actual_hours > 0:
+                estimated = original_estimate * (actual_hours / total_actual_hours)
+            else:
+                estimated = original_estimate / total_users
+            rows.append({
+                'Type of Work': label,
+                'Particular': summary,
+                'Resource Name': user_row['Author'],
+                'Extimated efforts': round(estimated, 2),
+                'Actual Effrots': round(actual_hours, 2),
+                'Remark': user_row['Issue Status'],
+            })
+    return pd.DataFrame(rows)
+
+def test_features_match_reference(app_module, export_5k):
+    export, _ = export_5k
+    df = app_module.parse_worklog_file(io.BytesIO(export_csv(export)), 'export.csv')
+    features = app_module.sprint_closure_tables(df)[2]
+    expected = reference_features(export)
+
+    keys = ['Type of Work', 'Particular', 'Resource Name']
+    merged = expected.merge(features, on=keys, how='outer', suffixes=('', ' (new)'), indicator=True)
+    assert (merged['_merge'] == 'both').all()
+    for col in ['Extimated efforts', 'Actual Effrots', 'Remark']:
+        pd.testing.assert_series_equal(merged[col], merged[f'{col} (new)'], check_names=False)
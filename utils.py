@@ -1,12 +1,123 @@
 import os
+import gc
+import ctypes
+import glob
 import json
 import uuid
-from datetime import datetime, timedelta
+import pickle
+import hashlib
 import shutil
+import sqlite3
+import multiprocessing
+import sys
+import threading
+import time
+from io import BytesIO
+from contextlib import closing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 
 TEMP_DIR = 'temp_data'
 
+# Memory guard: a monitor thread samples the process RSS every MEMORY_SAMPLE_SECONDS
+# while requests are tracked, recording each one's peak. MEMORY_LIMIT_MB (default:
+# the container's cgroup limit; none if neither is set) is the ceiling work is
+# planned against: work whose estimated footprint would take the RSS past
+# MEMORY_HEADROOM of it is degraded or rejected instead of risking an OOM kill.
+MEMORY_LIMIT_MB = float(os.environ.get('MEMORY_LIMIT_MB', 0))
+MEMORY_HEADROOM = float(os.environ.get('MEMORY_HEADROOM', 0.85))
+MEMORY_SAMPLE_SECONDS = float(os.environ.get('MEMORY_SAMPLE_SECONDS', 0.05))
+MEMORY_BUCKETS = tuple(mb * 1024 * 1024 for mb in (128, 256, 512, 1024, 2048, 4096, 8192))
+_memory_peaks = {}  # tracking id -> peak RSS in bytes
+_memory_lock = threading.Lock()
+_memory_monitor = None
+
+def _cgroup_memory_limit():
+    """The container's memory limit in bytes (cgroup v2 or v1), or 0 if unlimited"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # "max" (v2) or a huge page-aligned number (v1) mean no limit
+        return int(value) if value.isdigit() and int(value) < 2**60 else 0
+    return 0
+
+_memory_limit = int(MEMORY_LIMIT_MB * 1024 * 1024) or _cgroup_memory_limit()
+
+def _default_cache_mb(default_mb, share):
+    """Default cache budget: default_mb, or `share` of the memory ceiling if that is lower"""
+    if not _memory_limit:
+        return default_mb
+    return min(default_mb, _memory_limit * share / 2**20)
+
+# Per-worker cache of loaded session datasets, evicted least-recently-used
+# once the total size goes over the budget (in MB; by default 512, or a quarter
+# of the memory ceiling if that is lower).
+DATAFRAME_CACHE_MB = float(os.environ.get('DATAFRAME_CACHE_MB') or _default_cache_mb(512, 0.25))
+_dataframe_cache = OrderedDict()  # (file_id, aggregate name) -> (version, size in bytes, DataFrame)
+_dataframe_cache_lock = threading.Lock()
+
+# Per-worker cache of computed report panels and generated files, keyed by
+# dataset id and a hash of the report parameters, bounded by size (in MB; by
+# default 128, or a tenth of the memory ceiling if that is lower).
+RESULT_CACHE_MB = float(os.environ.get('RESULT_CACHE_MB') or _default_cache_mb(128, 0.1))
+_result_cache = OrderedDict()  # (file_id, kind, params hash) -> (size in bytes, result)
+_result_cache_lock = threading.Lock()
+
+# Worker processes for CPU-heavy exports, started on first use
+EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS', os.cpu_count() or 1))
+# Workers are forked from a single-threaded fork server, never from the app process:
+# its janitor, memory sampler and job threads may hold locks at fork time. The server
+# preloads the heavy imports so each worker starts quickly.
+EXPORT_PRELOAD_MODULES = ['numpy', 'pandas', 'xlsxwriter', 'openpyxl']
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+# Background report jobs (job id -> record, see submit_job), run on a thread pool and
+# dropped with their dataset or once finished for SESSION_FILE_TTL_SECONDS. Finished
+# jobs only record where their output is (the result cache), see drop_job_content.
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+_jobs = {}
+_jobs_lock = threading.Lock()
+_job_pool = None
+
+# Index of session files (datasets, aggregates, logos) per dataset id, so expiry and
+# removal never have to scan TEMP_DIR. A background janitor removes datasets whose
+# files haven't been written for SESSION_FILE_TTL_SECONDS.
+SESSION_FILE_TTL_SECONDS = float(os.environ.get('SESSION_FILE_TTL_SECONDS', 3600))
+JANITOR_INTERVAL_SECONDS = float(os.environ.get('JANITOR_INTERVAL_SECONDS', 300))
+_session_files = {}  # file_id -> {'paths': set of paths, 'updated': last write timestamp}
+_session_files_lock = threading.Lock()
+_janitor_thread = None
+
+# Per-process metrics exported at /metrics in the Prometheus text format: histograms
+# (stage and request durations, dataset sizes) and counters (cache lookups)
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ROW_BUCKETS = (1000, 10000, 100000, 1000000, 10000000)
+_METRICS = {
+    'timesheet_stage_seconds': ('histogram', 'Time spent in a processing stage'),
+    'timesheet_request_seconds': ('histogram', 'Time to produce a response, per endpoint'),
+    'timesheet_dataset_rows': ('histogram', 'Rows stored per upload or append'),
+    'timesheet_cache_requests_total': ('counter', 'Cache lookups by cache and result'),
+    'timesheet_request_peak_rss_bytes': ('histogram', 'Peak process RSS while a request ran, per endpoint'),
+    'timesheet_memory_limited_total': ('counter', 'Work degraded or rejected at the memory ceiling'),
+}
+_histograms = {}  # (name, labels) -> {'buckets': bucket bounds, 'counts': per-bucket counts, 'sum', 'count'}
+_counters = {}    # (name, labels) -> value
+_metrics_lock = threading.Lock()
+
+# On-demand request profiling: a sampler thread records the profiled thread's stack
+# every PROFILE_INTERVAL_SECONDS and the samples are written as speedscope JSON
+# (open in https://www.speedscope.app) to PROFILE_DIR, outside TEMP_DIR
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL_SECONDS = float(os.environ.get('PROFILE_INTERVAL_SECONDS', 0.005))
+
+# Burnout score history lives outside TEMP_DIR so it survives restarts
+BURNOUT_DB_PATH = os.environ.get('BURNOUT_DB_PATH', 'burnout_scores.db')
+
 def reset_temp_directory():
     """
     Completely removes and recreates the temp_data directory.
@@ -16,6 +127,8 @@ def reset_temp_directory():
         if os.path.exists(TEMP_DIR):
             shutil.rmtree(TEMP_DIR)
         os.makedirs(TEMP_DIR)
+        with _session_files_lock:
+            _session_files.clear()
         print(f"Successfully reset {TEMP_DIR} directory")
     except Exception as e:
         print(f"Error resetting temp directory: {str(e)}")
@@ -25,125 +138,678 @@ def ensure_temp_dir():
     if not os.path.exists(TEMP_DIR):
         os.makedirs(TEMP_DIR)
 
-def cleanup_old_files():
-    """Remove files older than 1 hour.
-    Handles all temporary files including:
-    - JSON data files
-    - Uploaded images (logo files)
-    - Any other temporary files in the directory
-    """
+def register_session_file(file_id, file_path):
+    """Record a file written for a session dataset (data, aggregate or logo)"""
+    with _session_files_lock:
+        entry = _session_files.setdefault(file_id, {'paths': set(), 'updated': 0.0})
+        entry['paths'].add(os.path.abspath(file_path))
+        entry['updated'] = time.time()
+
+def _index_existing_files():
+    """Add files already in TEMP_DIR (e.g. from an earlier process) to the index, once at janitor start"""
     ensure_temp_dir()
-    current_time = datetime.now()
-    cleaned_count = {"images": 0, "json": 0, "other": 0}
+    for filename in os.listdir(TEMP_DIR):
+        file_path = os.path.abspath(os.path.join(TEMP_DIR, filename))
+        if filename.startswith('logo_'):
+            file_id = os.path.splitext(filename[len('logo_'):])[0]
+        elif filename.endswith(('.parquet', '.parts.json')):
+            file_id = filename.split('.', 1)[0]
+        else:
+            file_id = filename  # anything else expires on its own
+        try:
+            modified = os.path.getmtime(file_path)
+        except OSError:
+            continue
+        with _session_files_lock:
+            entry = _session_files.setdefault(file_id, {'paths': set(), 'updated': 0.0})
+            entry['paths'].add(file_path)
+            entry['updated'] = max(entry['updated'], modified)
+
+def evict_expired_files():
+    """Remove datasets (with their aggregates and logo) not written for SESSION_FILE_TTL_SECONDS"""
+    cutoff = time.time() - SESSION_FILE_TTL_SECONDS
+    _drop_jobs(finished_before=cutoff)
+    with _session_files_lock:
+        candidates = {file_id: set(entry['paths']) for file_id, entry in _session_files.items()
+                      if entry['updated'] < cutoff}
+
+    removed = 0
+    for file_id, paths in candidates.items():
+        # Another worker process may have rewritten the files since they were indexed
+        modified = [os.path.getmtime(path) for path in paths if os.path.exists(path)]
+        if modified and max(modified) >= cutoff:
+            with _session_files_lock:
+                if file_id in _session_files:
+                    _session_files[file_id]['updated'] = max(modified)
+            continue
+        remove_dataframe(file_id)
+        removed += 1
 
+    if removed:
+        print(f"Cleanup completed: Removed {removed} expired datasets")
+
+def _janitor_loop():
     try:
-        for filename in os.listdir(TEMP_DIR):
-            filepath = os.path.join(TEMP_DIR, filename)
-            file_modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-            
-            # Check if file is older than 1 hour
-            if current_time - file_modified > timedelta(hours=1):
-                try:
-                    if os.path.isfile(filepath):
-                        # Categorize the file type
-                        if filename.startswith('logo_'):
-                            cleaned_count["images"] += 1
-                        elif filename.endswith('.json'):
-                            cleaned_count["json"] += 1
-                        else:
-                            cleaned_count["other"] += 1
-                        
-                        os.remove(filepath)
-                    elif os.path.isdir(filepath):
-                        shutil.rmtree(filepath)
-                        cleaned_count["other"] += 1
-                except (OSError, IOError) as e:
-                    print(f"Error cleaning up file {filename}: {str(e)}")
-
-        print(f"Cleanup completed: Removed {cleaned_count['images']} images, "
-              f"{cleaned_count['json']} JSON files, and {cleaned_count['other']} other files")
+        _index_existing_files()
     except Exception as e:
-        print(f"Error during cleanup: {str(e)}")
+        print(f"Error indexing temp directory: {str(e)}")
+    while True:
+        try:
+            evict_expired_files()
+        except Exception as e:
+            print(f"Error during cleanup: {str(e)}")
+        time.sleep(JANITOR_INTERVAL_SECONDS)
+
+def start_janitor():
+    """Start the background thread that evicts expired session files (once per process)"""
+    global _janitor_thread
+    with _session_files_lock:
+        if _janitor_thread is None:
+            _janitor_thread = threading.Thread(target=_janitor_loop, name='temp-janitor', daemon=True)
+            _janitor_thread.start()
+
+def _data_path(file_id, name=None):
+    """Path of the columnar data file for a session dataset or one of its aggregates"""
+    if name:
+        return os.path.join(TEMP_DIR, f"{file_id}.{name}.parquet")
+    return os.path.join(TEMP_DIR, f"{file_id}.parquet")
+
+def _parts_manifest_path(file_id):
+    """Path of the list of part files appended to a session dataset (see append_dataframe)"""
+    return os.path.join(TEMP_DIR, f"{file_id}.parts.json")
+
+def _write_parquet(df, file_path):
+    """Write a DataFrame as zstd-compressed Parquet"""
+    _prepare_for_parquet(df).to_parquet(file_path, engine='pyarrow', compression='zstd', index=False)
+
+def _prepare_for_parquet(df):
+    """Make a DataFrame safe to store as Parquet.
+    Arrow needs string column names and one type per column, while Excel/CSV
+    uploads often mix numbers and text in the same column (e.g. Labels).
+    """
+    df = df.copy(deep=False)
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def to_parquet_bytes(df):
+    """Serialize a DataFrame as zstd-compressed Parquet (e.g. for downloads)"""
+    buffer = BytesIO()
+    _write_parquet(df, buffer)
+    return buffer.getvalue()
 
 def save_dataframe(df):
-    """Save DataFrame to temporary file and return ID"""
+    """Save DataFrame to a compressed Parquet file and return ID.
+    Parquet keeps dtypes (datetimes, ints, categoricals) so loaded frames
+    don't need to be re-parsed by every route.
+    """
     ensure_temp_dir()
-    cleanup_old_files()
     
     file_id = str(uuid.uuid4())
-    file_path = os.path.join(TEMP_DIR, f"{file_id}.json")
-    
-    # Save to JSON
-    df.to_json(file_path)
+    _write_parquet(df, _data_path(file_id))
+    register_session_file(file_id, _data_path(file_id))
+    observe('timesheet_dataset_rows', len(df), ROW_BUCKETS, source='upload')
     return file_id
 
-def load_dataframe(file_id):
-    """Load DataFrame from temporary file"""
-    import pandas as pd
-    
-    file_path = os.path.join(TEMP_DIR, f"{file_id}.json")
-    if not os.path.exists(file_path):
+def append_dataframe(file_id, df):
+    """Store new rows of a session dataset as a part file next to it.
+    Only the new rows are written; loads return the dataset followed by its
+    parts in append order (listed in the dataset's parts manifest, so loads
+    never scan TEMP_DIR), and a cached copy is extended rather than reloaded.
+    """
+    ensure_temp_dir()
+    key = (file_id, None)
+    paths = _dataset_paths(file_id)
+    with _dataframe_cache_lock:
+        entry = _dataframe_cache.get(key)
+    cached = entry[2] if entry and entry[0] == _dataset_version(paths) else None
+
+    part_path = _data_path(file_id, f"part-{len(paths):05d}")
+    df = _prepare_for_parquet(df)
+    _write_parquet(df, part_path)
+    register_session_file(file_id, part_path)
+
+    # The manifest is replaced in one step, so loads see the part once it's complete
+    manifest_path = _parts_manifest_path(file_id)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump([os.path.basename(path) for path in paths[1:] + [part_path]], f)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    register_session_file(file_id, manifest_path)
+    invalidate_results(file_id)
+    observe('timesheet_dataset_rows', len(df), ROW_BUCKETS, source='append')
+
+    if cached is not None:
+        _cache_dataframe(key, _dataset_version(paths + [part_path]), concat_frames([cached, df]))
+
+def concat_frames(frames):
+    """Concatenate frames with the same columns, keeping categorical columns
+    categorical (pd.concat falls back to object when the categories differ).
+    """
+    if len(frames) == 1:
+        return frames[0]
+    frames = [frame.copy(deep=False) for frame in frames]
+    for col in frames[0].columns:
+        if not all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            continue
+        categories = frames[0][col].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[col].cat.categories)
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+def _dataset_paths(file_id):
+    """Data file of a session dataset followed by its appended parts (from its manifest)"""
+    try:
+        with open(_parts_manifest_path(file_id)) as f:
+            parts = json.load(f)
+    except FileNotFoundError:
+        parts = []
+    return [_data_path(file_id)] + [os.path.join(TEMP_DIR, part) for part in parts]
+
+def _dataset_version(paths):
+    """Cache validation stamp for a stored table (raises OSError if a file is missing)"""
+    return len(paths), max(os.path.getmtime(path) for path in paths)
+
+def _cache_dataframe(key, version, df):
+    """Add a loaded DataFrame to the cache and evict the oldest entries over budget"""
+    budget = DATAFRAME_CACHE_MB * 1024 * 1024
+    size = int(df.memory_usage(deep=True).sum())
+    if size > budget:
+        return
+
+    with _dataframe_cache_lock:
+        _dataframe_cache[key] = (version, size, df)
+        _dataframe_cache.move_to_end(key)
+        total = sum(entry[1] for entry in _dataframe_cache.values())
+        while total > budget and len(_dataframe_cache) > 1:
+            _, (_, evicted_size, _) = _dataframe_cache.popitem(last=False)
+            total -= evicted_size
+
+def _uncache_dataframe(file_id):
+    """Drop a dataset and its aggregates from the in-process cache"""
+    with _dataframe_cache_lock:
+        for key in [key for key in _dataframe_cache if key[0] == file_id]:
+            del _dataframe_cache[key]
+
+def _load_parquet(file_id, name=None):
+    """Load a stored DataFrame (a dataset with its parts, or an aggregate) through the in-process cache"""
+    key = (file_id, name)
+    paths = [_data_path(file_id, name)] if name else _dataset_paths(file_id)
+    try:
+        version = _dataset_version(paths)
+    except OSError:
+        with _dataframe_cache_lock:
+            _dataframe_cache.pop(key, None)
         return None
-        
-    return pd.read_json(file_path)
+
+    with _dataframe_cache_lock:
+        entry = _dataframe_cache.get(key)
+        if entry and entry[0] == version:
+            _dataframe_cache.move_to_end(key)
+            increment('timesheet_cache_requests_total', cache='dataframe', result='hit')
+            return entry[2]
+
+    increment('timesheet_cache_requests_total', cache='dataframe', result='miss')
+    df = concat_frames([pd.read_parquet(path, engine='pyarrow', memory_map=True) for path in paths])
+    _cache_dataframe(key, version, df)
+    return df
+
+def load_dataframe(file_id):
+    """Load DataFrame from the in-process cache or its temporary file.
+    The returned frame is shared between requests and must not be modified
+    in place; callers filter or copy it before adding columns.
+    """
+    return _load_parquet(file_id)
+
+def save_aggregate(file_id, name, df):
+    """Store a derived table (e.g. the daily cube) next to a session dataset"""
+    ensure_temp_dir()
+    _write_parquet(df, _data_path(file_id, name))
+    register_session_file(file_id, _data_path(file_id, name))
+
+def load_aggregate(file_id, name):
+    """Load a derived table stored with save_aggregate, or None if missing.
+    Like load_dataframe, the returned frame is shared and read-only.
+    """
+    return _load_parquet(file_id, name)
+
+def _params_hash(params):
+    """Stable hash of report parameters.
+    List values are treated as sets (author, working day and holiday selections
+    don't depend on order) and numbers are normalized to floats.
+    """
+    normalized = {}
+    for key, value in params.items():
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item) for item in value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        normalized[key] = value
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def get_cached_result(file_id, kind, params, default=None):
+    """Return the cached result for (file_id, kind, params), or default on a miss"""
+    key = (file_id, kind, _params_hash(params))
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is not None:
+            _result_cache.move_to_end(key)
+    increment('timesheet_cache_requests_total', cache='result', result='miss' if entry is None else 'hit')
+    return default if entry is None else entry[1]
+
+def store_result(file_id, kind, params, result):
+    """Cache a computed result, evicting the oldest entries over budget.
+    Returns False if the result is larger than the whole budget (not cached).
+    """
+    if isinstance(result, bytes):
+        size = len(result)
+    else:
+        size = len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    budget = RESULT_CACHE_MB * 1024 * 1024
+    if size > budget:
+        return False
+
+    key = (file_id, kind, _params_hash(params))
+    with _result_cache_lock:
+        _result_cache[key] = (size, result)
+        _result_cache.move_to_end(key)
+        total = sum(entry[0] for entry in _result_cache.values())
+        while total > budget:
+            _, (evicted_size, _) = _result_cache.popitem(last=False)
+            total -= evicted_size
+    return True
+
+_MISSING = object()
+
+def cached_result(file_id, kind, params, compute):
+    """Return the cached result for (file_id, kind, params), computing it on a miss.
+    Results are shared between requests and must be treated as read-only.
+    """
+    result = get_cached_result(file_id, kind, params, _MISSING)
+    if result is _MISSING:
+        result = compute()
+        store_result(file_id, kind, params, result)
+    return result
+
+def submit_job(file_id, run, total=1):
+    """Queue run(advance) on the job pool and return the job id.
+    run calls advance() as each of the job's `total` units of work finishes and
+    returns the job's result.
+    """
+    global _job_pool
+    job_id = str(uuid.uuid4())
+    job = {'file_id': file_id, 'status': 'queued', 'completed': 0, 'total': total,
+           'result': None, 'error': None, 'error_type': None, 'finished': None}
+
+    def advance():
+        with _jobs_lock:
+            job['completed'] = min(job['completed'] + 1, job['total'])
+
+    def execute():
+        with _jobs_lock:
+            job['status'] = 'running'
+        try:
+            result = run(advance)
+        except Exception as e:
+            print(f"Job {job_id} failed: {str(e)}")
+            with _jobs_lock:
+                job.update(status='failed', error=str(e), error_type=type(e), finished=time.time())
+        else:
+            with _jobs_lock:
+                job.update(status='done', result=result, completed=job['total'], finished=time.time())
+
+    with _jobs_lock:
+        _jobs[job_id] = job
+        if _job_pool is None:
+            _job_pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='report-job')
+        pool = _job_pool
+    pool.submit(execute)
+    return job_id
+
+def get_job(job_id):
+    """Snapshot of a job record (file_id, status, completed, total, result, error, error_type), or None"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+def drop_job_content(job_id):
+    """Release output a finished job holds itself (too large for the result cache)"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is not None and job['result'] is not None:
+            job['result'] = {key: value for key, value in job['result'].items() if key != 'content'}
+
+def _drop_jobs(file_id=None, finished_before=None):
+    """Forget a dataset's jobs, or jobs finished before a timestamp"""
+    with _jobs_lock:
+        for job_id, job in list(_jobs.items()):
+            if job['file_id'] == file_id or (
+                    finished_before is not None and job['finished'] is not None and job['finished'] < finished_before):
+                del _jobs[job_id]
+
+def get_export_pool():
+    """Shared process pool for CPU-heavy exports (EXPORT_WORKERS processes)"""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(EXPORT_PRELOAD_MODULES)
+            _export_pool = ProcessPoolExecutor(max_workers=EXPORT_WORKERS, mp_context=context)
+        return _export_pool
+
+def invalidate_results(file_id):
+    """Drop all cached results computed from a dataset"""
+    with _result_cache_lock:
+        for key in [key for key in _result_cache if key[0] == file_id]:
+            del _result_cache[key]
 
 def remove_dataframe(file_id):
-    """Remove temporary DataFrame file and its associated logo file"""
+    """Remove a session dataset's files (data, aggregates and logo)"""
     if not file_id:
         return
 
-    # Remove JSON data file
-    file_path = os.path.join(TEMP_DIR, f"{file_id}.json")
-    if os.path.exists(file_path):
+    _uncache_dataframe(file_id)
+    invalidate_results(file_id)
+    _drop_jobs(file_id)
+
+    with _session_files_lock:
+        entry = _session_files.pop(file_id, None)
+    if entry is not None:
+        paths = entry['paths']
+    else:
+        # Not written by this process: fall back to the known file name patterns
+        paths = ([_data_path(file_id), _parts_manifest_path(file_id)] + glob.glob(_data_path(file_id, '*'))
+                 + glob.glob(os.path.join(TEMP_DIR, f"logo_{glob.escape(file_id)}*")))
+
+    for file_path in paths:
         try:
-            os.remove(file_path)
+            if os.path.isdir(file_path):
+                shutil.rmtree(file_path)
+            elif os.path.exists(file_path):
+                os.remove(file_path)
         except OSError as e:
-            print(f"Error removing data file: {str(e)}")
-
-    # Remove only the logo file associated with this session
-    try:
-        # Look for any file that starts with logo_{file_id}
-        for filename in os.listdir(TEMP_DIR):
-            if filename.startswith(f"logo_{file_id}"):
-                logo_path = os.path.join(TEMP_DIR, filename)
-                if os.path.exists(logo_path):
-                    os.remove(logo_path)
-                break  # Found and removed the associated logo file
-    except OSError as e:
-        print(f"Error cleaning up logo file: {str(e)}")
+            print(f"Error removing session file: {str(e)}")
 
 def get_temp_dir():
     """Get the temporary directory path, ensuring it exists"""
     ensure_temp_dir()
     return os.path.abspath(TEMP_DIR)
 
-def should_run_cleanup():
-    """Check if cleanup should be run (more than 1 hour since last cleanup)"""
-    cleanup_marker = os.path.join(TEMP_DIR, '.last_cleanup')
-    
-    if not os.path.exists(cleanup_marker):
-        return True
-        
+def _connect_burnout_db():
+    """Open the burnout score store, creating its table if needed"""
+    conn = sqlite3.connect(BURNOUT_DB_PATH, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS burnout_scores ("
+        " author TEXT NOT NULL,"
+        " week_start TEXT NOT NULL,"  # Monday of the week, YYYY-MM-DD
+        " overtime REAL NOT NULL,"
+        " score REAL NOT NULL,"
+        " PRIMARY KEY (author, week_start))"
+    )
+    return conn
+
+def load_burnout_scores(authors):
+    """
+    Return each author's latest stored week as a DataFrame with columns author,
+    week_start, score and previous_score (the score going into that week).
+    """
+    authors = [str(author) for author in authors]
+    if not authors:
+        return pd.DataFrame(columns=['author', 'week_start', 'score', 'previous_score'])
+
+    placeholders = ','.join('?' * len(authors))
+    query = (
+        "SELECT author, week_start, score, previous_score FROM ("
+        " SELECT author, week_start, score,"
+        " LAG(score, 1, 0) OVER (PARTITION BY author ORDER BY week_start) AS previous_score,"
+        " ROW_NUMBER() OVER (PARTITION BY author ORDER BY week_start DESC) AS recency"
+        f" FROM burnout_scores WHERE author IN ({placeholders}))"
+        " WHERE recency = 1"
+    )
+    with closing(_connect_burnout_db()) as conn:
+        return pd.read_sql_query(query, conn, params=authors)
+
+def save_burnout_scores(scores):
+    """Insert or replace weekly scores (DataFrame with author, week_start, overtime, score)"""
+    if scores.empty:
+        return
+
+    rows = scores[['author', 'week_start', 'overtime', 'score']].itertuples(index=False, name=None)
+    with closing(_connect_burnout_db()) as conn:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO burnout_scores (author, week_start, overtime, score)"
+                " VALUES (?, ?, ?, ?)",
+                [(str(author), week_start, float(overtime), float(score)) for author, week_start, overtime, score in rows]
+            )
+
+def observe(name, value, buckets=METRIC_BUCKETS, **labels):
+    """Record a value in a histogram (see _METRICS)"""
+    key = (name, tuple(sorted(labels.items())))
+    with _metrics_lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {'buckets': buckets, 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                histogram['counts'][i] += 1
+                break
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+def increment(name, amount=1, **labels):
+    """Add to a counter (see _METRICS)"""
+    key = (name, tuple(sorted(labels.items())))
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def _metric_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+def render_metrics():
+    """All metrics, plus cache hit ratios and sizes, in the Prometheus text format"""
+    with _metrics_lock:
+        histograms = {key: dict(value, counts=list(value['counts'])) for key, value in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for name, (metric_type, help_text) in _METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        if metric_type == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_metric_labels(labels)} {value}")
+            continue
+        for (metric, labels), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(histogram['buckets'], histogram['counts']):
+                cumulative += count
+                lines.append(f"{name}_bucket{_metric_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{name}_bucket{_metric_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            lines.append(f"{name}_sum{_metric_labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"{name}_count{_metric_labels(labels)} {histogram['count']}")
+
+    # Derived gauges: hit ratio per cache and the current size of the in-process caches
+    lines += ["# HELP timesheet_cache_hit_ratio Share of cache lookups that were hits",
+              "# TYPE timesheet_cache_hit_ratio gauge"]
+    for cache in ('dataframe', 'result'):
+        hits = counters.get(('timesheet_cache_requests_total', (('cache', cache), ('result', 'hit'))), 0)
+        misses = counters.get(('timesheet_cache_requests_total', (('cache', cache), ('result', 'miss'))), 0)
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f'timesheet_cache_hit_ratio{{cache="{cache}"}} {ratio:.4f}')
+
+    with _dataframe_cache_lock:
+        frames = list(_dataframe_cache.items())
+    with _result_cache_lock:
+        result_bytes = sum(entry[0] for entry in _result_cache.values())
+        result_entries = len(_result_cache)
+    lines += ["# HELP timesheet_cache_bytes Approximate size of an in-process cache",
+              "# TYPE timesheet_cache_bytes gauge",
+              f'timesheet_cache_bytes{{cache="dataframe"}} {sum(entry[1] for _, entry in frames)}',
+              f'timesheet_cache_bytes{{cache="result"}} {result_bytes}',
+              "# HELP timesheet_cache_entries Entries in an in-process cache",
+              "# TYPE timesheet_cache_entries gauge",
+              f'timesheet_cache_entries{{cache="dataframe"}} {len(frames)}',
+              f'timesheet_cache_entries{{cache="result"}} {result_entries}',
+              "# HELP timesheet_cached_dataset_rows Worklog rows of the datasets held in the cache",
+              "# TYPE timesheet_cached_dataset_rows gauge",
+              f"timesheet_cached_dataset_rows {sum(len(entry[2]) for (_, name), entry in frames if name is None)}",
+              "# HELP timesheet_process_rss_bytes Resident memory of this process",
+              "# TYPE timesheet_process_rss_bytes gauge",
+              f"timesheet_process_rss_bytes {process_rss()}",
+              "# HELP timesheet_memory_limit_bytes Memory ceiling requests are planned against (0 = none)",
+              "# TYPE timesheet_memory_limit_bytes gauge",
+              f"timesheet_memory_limit_bytes {memory_limit()}"]
+    return '\n'.join(lines) + '\n'
+
+def process_rss():
+    """Resident memory of this process in bytes"""
     try:
-        with open(cleanup_marker, 'r') as f:
-            last_cleanup_str = f.read().strip()
-            last_cleanup = datetime.fromisoformat(last_cleanup_str)
-            
-        return datetime.now() - last_cleanup > timedelta(hours=1)
-    except (ValueError, IOError) as e:
-        # If there's any error reading the file, assume we should run cleanup
-        print(f"Error checking cleanup time: {str(e)}")
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # No procfs (e.g. macOS): fall back to the process's peak RSS
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def memory_limit():
+    """Memory ceiling in bytes (0 = none)"""
+    return _memory_limit
+
+def memory_available(required_bytes):
+    """Whether `required_bytes` more can be allocated without passing MEMORY_HEADROOM of the ceiling"""
+    if not _memory_limit:
         return True
+    return process_rss() + required_bytes <= _memory_limit * MEMORY_HEADROOM
 
-def mark_cleanup_complete():
-    """Mark that cleanup has been completed"""
-    cleanup_marker = os.path.join(TEMP_DIR, '.last_cleanup')
-    ensure_temp_dir()
-    
+def reclaim_memory(keep_file_id=None):
+    """
+    Drop other datasets' entries from the dataframe and result caches, collect
+    garbage and hand freed heap back to the OS. Returns the cached bytes released.
+    """
+    with _dataframe_cache_lock:
+        keys = [key for key in _dataframe_cache if key[0] != keep_file_id]
+        released = sum(_dataframe_cache.pop(key)[1] for key in keys)
+    with _result_cache_lock:
+        keys = [key for key in _result_cache if key[0] != keep_file_id]
+        released += sum(_result_cache.pop(key)[0] for key in keys)
+
+    gc.collect()
     try:
-        with open(cleanup_marker, 'w') as f:
-            f.write(datetime.now().isoformat())
-    except IOError as e:
-        print(f"Error marking cleanup complete: {str(e)}")
-        # Not critical if we fail to mark completion
-        # Worst case: we'll try cleanup again on next request
+        # glibc keeps freed memory in the process unless asked to release it
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    print(f"Memory - released {released / 2**20:.0f} MB of cached data from other datasets")
+    return released
+
+def dataframe_bytes(file_id, df):
+    """In-memory size of a session dataset (from the dataframe cache when it holds this frame)"""
+    with _dataframe_cache_lock:
+        entry = _dataframe_cache.get((file_id, None))
+    if entry is not None and entry[2] is df:
+        return entry[1]
+    return int(df.memory_usage(deep=True).sum())
+
+def _monitor_memory():
+    while True:
+        time.sleep(MEMORY_SAMPLE_SECONDS)
+        with _memory_lock:
+            if not _memory_peaks:
+                continue
+        rss = process_rss()
+        with _memory_lock:
+            for tracking_id, peak in _memory_peaks.items():
+                if rss > peak:
+                    _memory_peaks[tracking_id] = rss
+
+def start_memory_tracking():
+    """Start recording the peak process RSS; returns the id for stop_memory_tracking"""
+    global _memory_monitor
+    tracking_id = uuid.uuid4().hex
+    rss = process_rss()
+    with _memory_lock:
+        _memory_peaks[tracking_id] = rss
+        if _memory_monitor is None:
+            _memory_monitor = threading.Thread(target=_monitor_memory, daemon=True)
+            _memory_monitor.start()
+    return tracking_id, rss
+
+def stop_memory_tracking(tracking):
+    """Stop tracking; returns (RSS at the start, peak RSS) in bytes"""
+    tracking_id, start_rss = tracking
+    rss = process_rss()
+    with _memory_lock:
+        peak = max(_memory_peaks.pop(tracking_id, rss), rss)
+    return start_rss, peak
+
+def start_profile(name):
+    """Start sampling the calling thread's stack; returns the profile handle for stop_profile"""
+    profile = {
+        'name': name,
+        'path': os.path.join(PROFILE_DIR, f"{name}.speedscope.json"),
+        'thread_id': threading.get_ident(),
+        'frames': {},    # (function, file, line) -> index in the speedscope frame table
+        'samples': [],   # frame indices, outermost first
+        'weights': [],   # seconds covered by each sample
+        'stop': threading.Event(),
+    }
+    profile['sampler'] = threading.Thread(target=_sample_stacks, args=(profile,), daemon=True)
+    profile['sampler'].start()
+    return profile
+
+def _sample_stacks(profile):
+    frames = profile['frames']
+    last = time.perf_counter()
+    while not profile['stop'].wait(PROFILE_INTERVAL_SECONDS):
+        frame = sys._current_frames().get(profile['thread_id'])
+        now = time.perf_counter()
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            # co_qualname is new in Python 3.11 (deployments may run 3.10)
+            name = getattr(code, 'co_qualname', code.co_name)
+            stack.append(frames.setdefault((name, code.co_filename, code.co_firstlineno), len(frames)))
+            frame = frame.f_back
+        if stack:
+            profile['samples'].append(stack[::-1])
+            profile['weights'].append(now - last)
+        last = now
+
+def stop_profile(profile):
+    """Stop sampling and write the profile to its speedscope file; returns the path"""
+    profile['stop'].set()
+    profile['sampler'].join()
+
+    frames = sorted(profile['frames'], key=profile['frames'].get)
+    document = {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': profile['name'],
+        'exporter': 'timesheet-profiler',
+        'activeProfileIndex': 0,
+        'shared': {'frames': [{'name': name, 'file': file, 'line': line} for name, file, line in frames]},
+        'profiles': [{
+            'type': 'sampled',
+            'name': profile['name'],
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': sum(profile['weights']),
+            'samples': profile['samples'],
+            'weights': profile['weights'],
+        }],
+    }
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(profile['path'], 'w') as f:
+        json.dump(document, f)
+    print(f"Profile written to {profile['path']} ({len(profile['samples'])} samples)")
+    return profile['path']